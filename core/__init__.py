@@ -7,6 +7,7 @@ from core.metrics import portfolio_metrics, compute_cvar, compute_max_drawdown
 from core.execution import ExecutionModel
 from core.logging import setup_mlflow_logger, log_backtest_results, end_mlflow_run
 from core.data import DataManager, load_sample_data
+from core.config import load_yaml_cached
 
 __all__ = [
     "Backtester",
@@ -20,4 +21,5 @@ __all__ = [
     "end_mlflow_run",
     "DataManager",
     "load_sample_data",
+    "load_yaml_cached",
 ]
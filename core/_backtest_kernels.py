@@ -0,0 +1,26 @@
+"""Numba-compiled inner loops for the backtesting engine."""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def _run_equity_loop(weights, returns, initial, tc_bps, slippage):
+    """
+    Advance equity bar by bar.
+    
+    Execution costs are charged on turnover |w[t] - w[t-1]| before the
+    bar's portfolio return w[t] * r[t] is applied.
+    """
+    n = weights.shape[0]
+    equity = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return equity
+    
+    cost_rate = tc_bps / 10000.0 + slippage
+    equity[0] = initial
+    for t in range(1, n):
+        trade_size = abs(weights[t] - weights[t - 1])
+        e = equity[t - 1] - equity[t - 1] * trade_size * cost_rate
+        equity[t] = e * (1.0 + weights[t] * returns[t])
+    return equity
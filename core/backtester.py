@@ -3,8 +3,11 @@
 import numpy as np
 import pandas as pd
 from dataclasses import dataclass, asdict
-from typing import Dict, List, Callable
+from typing import Dict, List, Callable, Optional
 import logging
+import warnings
+
+from core._backtest_kernels import _run_equity_loop
 
 logger = logging.getLogger(__name__)
 
@@ -29,53 +32,68 @@ class Backtester:
     def __init__(self, config: BacktestConfig):
         self.config = config
         np.random.seed(config.seed)
-        self.equity_curve = []
+        self.equity_curve = np.empty(0, dtype=np.float64)
         self.trades = []
         logger.info(f"Backtester initialized: {config.start_date} to {config.end_date}")
     
-    def run(self, prices: pd.DataFrame, signal_func: Callable, weights_func: Callable):
-        """Run backtest with walk-forward safety."""
+    def run(self, prices: pd.DataFrame, signal_func: Optional[Callable] = None,
+            weights_func: Optional[Callable] = None,
+            vector_signal_func: Optional[Callable] = None):
+        """
+        Run backtest with walk-forward safety.
+        
+        Parameters:
+            prices: OHLCV frame indexed by date
+            vector_signal_func: f(prices) -> target weight per bar, aligned with
+                prices.index. The weight at bar t may only use data up to t.
+            signal_func, weights_func: Deprecated per-bar callables, evaluated
+                on prices.iloc[:t+1] at every bar (O(N^2)).
+        """
         
-        # Filter date range
-        mask = (prices.index >= self.config.start_date) & (prices.index <= self.config.end_date)
-        prices = prices[mask].copy()
+        # Filter date range (binary-search bounds on a sorted index, no copy)
+        if prices.index.is_monotonic_increasing:
+            i0 = prices.index.searchsorted(pd.Timestamp(self.config.start_date), side='left')
+            i1 = prices.index.searchsorted(pd.Timestamp(self.config.end_date), side='right')
+            prices = prices.iloc[i0:i1]
+        else:
+            mask = (prices.index >= self.config.start_date) & (prices.index <= self.config.end_date)
+            prices = prices[mask]
         
         # Calculate returns if not present
-        if 'returns' not in prices.columns:
-            prices['returns'] = prices['close'].pct_change()
+        if 'returns' in prices.columns:
+            returns = prices['returns'].to_numpy(dtype=np.float64)
+        else:
+            close = prices['close'].to_numpy(dtype=np.float64)
+            returns = np.empty_like(close)
+            returns[:1] = np.nan
+            np.divide(close[1:], close[:-1], out=returns[1:])
+            returns[1:] -= 1.0
+            prices = prices.assign(returns=returns)
         
-        # Initialize
-        equity = self.config.initial_capital
-        self.equity_curve = [equity]
-        prev_weight = 0.0
+        # Target weight per bar (no position is held before the first bar)
+        if vector_signal_func is not None:
+            weights = np.array(vector_signal_func(prices), dtype=np.float64)
+        elif signal_func is not None and weights_func is not None:
+            weights = self._legacy_weights(prices, signal_func, weights_func)
+        else:
+            raise ValueError("Provide vector_signal_func or both signal_func and weights_func")
         
-        # Event-driven loop
-        for t in range(1, len(prices)):
-            # Only use data up to time t
-            available_data = prices.iloc[:t+1]
-            
-            # Generate signals
-            signals = signal_func(available_data)
-            
-            # Compute weights
-            target_weight = weights_func(signals)
-            
-            # Calculate execution costs
-            trade_size = abs(target_weight - prev_weight)
-            exec_cost = equity * trade_size * (self.config.transaction_cost_bps / 10000 + self.config.slippage_pct)
-            
-            # Deduct costs
-            equity -= exec_cost
-            
-            # Apply returns
-            portfolio_return = target_weight * prices.iloc[t]['returns']
-            equity *= (1 + portfolio_return)
-            
-            self.equity_curve.append(equity)
-            prev_weight = target_weight
+        if len(weights) != len(prices):
+            raise ValueError(f"Signal length {len(weights)} != price length {len(prices)}")
+        weights[0] = 0.0
+        
+        # Deduct execution costs and apply returns bar by bar
+        equity = _run_equity_loop(
+            weights,
+            returns,
+            float(self.config.initial_capital),
+            float(self.config.transaction_cost_bps),
+            float(self.config.slippage_pct),
+        )
+        self.equity_curve = equity
         
         # Create equity series
-        equity_series = pd.Series(self.equity_curve, index=prices.index)
+        equity_series = pd.Series(equity, index=prices.index, copy=False)
         returns_series = equity_series.pct_change().dropna()
         
         # Compute metrics
@@ -88,6 +106,21 @@ class Backtester:
             'config': self.config
         }
     
+    @staticmethod
+    def _legacy_weights(prices: pd.DataFrame, signal_func: Callable,
+                        weights_func: Callable) -> np.ndarray:
+        """Evaluate per-bar signal/weights callables on expanding windows."""
+        warnings.warn(
+            "signal_func/weights_func are deprecated; pass vector_signal_func instead",
+            DeprecationWarning,
+            stacklevel=3,
+        )
+        weights = np.zeros(len(prices), dtype=np.float64)
+        for t in range(1, len(prices)):
+            # Only use data up to time t
+            weights[t] = weights_func(signal_func(prices.iloc[:t+1]))
+        return weights
+    
     def _compute_metrics(self, returns: pd.Series):
         """Compute performance metrics."""
         from core.metrics import portfolio_metrics
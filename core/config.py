@@ -0,0 +1,58 @@
+"""YAML config loading with a parsed-JSON sidecar cache."""
+
+import json
+import os
+import tempfile
+import yaml
+from pathlib import Path
+from typing import Dict
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+
+def load_yaml_cached(path: str) -> Dict:
+    """
+    Load a YAML config, reusing `<path>.cache.json` while it is up to date.
+    
+    The sidecar is rewritten whenever the YAML file is newer. Configs that
+    do not survive a JSON round trip unchanged (e.g. unquoted YAML dates,
+    non-string mapping keys) are never cached.
+    """
+    path = Path(path)
+    cache_path = path.with_name(path.name + '.cache.json')
+    
+    if cache_path.exists() and cache_path.stat().st_mtime >= path.stat().st_mtime:
+        with open(cache_path, 'r') as f:
+            return json.load(f)
+    
+    with open(path, 'r') as f:
+        config = yaml.load(f, Loader=SafeLoader)
+    
+    try:
+        payload = json.dumps(config)
+    except TypeError:
+        return config
+    
+    # json.dumps stringifies int/float/bool keys; cache only exact round trips
+    if json.loads(payload) != config:
+        return config
+    
+    # Atomic write so a concurrent reader never sees a partial cache
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix='.tmp')
+    except OSError:
+        return config
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(payload)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    
+    return config
@@ -3,6 +3,9 @@
 import pandas as pd
 import json
 import hashlib
+import mmap
+import os
+import xxhash
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Optional
@@ -36,7 +39,16 @@ class DataManager:
         snapshot_id = f"{name}_{timestamp}"
         filepath = self.snapshots_dir / f"{snapshot_id}.parquet"
         
-        df.to_parquet(filepath)
+        if 'ticker' in df.columns:
+            df = df.assign(ticker=df['ticker'].astype('category'))
+        df.to_parquet(
+            filepath,
+            engine='pyarrow',
+            compression='zstd',
+            compression_level=3,
+            use_dictionary=['ticker'] if 'ticker' in df.columns else False,
+            row_group_size=200_000,
+        )
         
         file_hash = self._compute_hash(filepath)
         
@@ -47,7 +59,8 @@ class DataManager:
             'filepath': str(filepath),
             'rows': len(df),
             'columns': list(df.columns),
-            'hash_md5': file_hash,
+            'hash_xxh3': file_hash,
+            'compression': 'zstd',
             'size_mb': filepath.stat().st_size / (1024**2)
         }
         
@@ -65,22 +78,58 @@ class DataManager:
         print(f"✓ Loaded snapshot: {snapshot_id} ({len(df)} rows)")
         return df
     
+    def verify_snapshot(self, snapshot_id: str) -> bool:
+        """Check a snapshot file against its recorded hash (xxh3 or legacy MD5)."""
+        if snapshot_id not in self.manifest:
+            raise ValueError(f"Snapshot not found: {snapshot_id}")
+        
+        entry = self.manifest[snapshot_id]
+        filepath = Path(entry['filepath'])
+        if 'hash_xxh3' in entry:
+            return self._compute_hash(filepath) == entry['hash_xxh3']
+        return self._compute_md5(filepath) == entry['hash_md5']
+    
     def list_snapshots(self) -> Dict:
         """List all available snapshots."""
         return self.manifest
     
     @staticmethod
-    def _compute_hash(filepath: Path) -> str:
-        """Compute MD5 hash of file."""
-        hash_md5 = hashlib.md5()
+    def _digest_file(filepath: Path, digest) -> str:
+        """Hash a whole file in C: file_digest on 3.11+, mmap on older Pythons."""
         with open(filepath, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+            if hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, digest).hexdigest()
+            h = digest()
+            if os.fstat(f.fileno()).st_size > 0:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    h.update(mm)
+            return h.hexdigest()
+    
+    @staticmethod
+    def _compute_hash(filepath: Path) -> str:
+        """Compute xxh3-128 hash of file."""
+        return DataManager._digest_file(filepath, xxhash.xxh3_128)
+    
+    @staticmethod
+    def _compute_md5(filepath: Path) -> str:
+        """Compute MD5 hash of file (manifests written before xxh3)."""
+        return DataManager._digest_file(filepath, hashlib.md5)
+
+
+SAMPLE_DATA_CACHE = Path("data/cache/spy_2020_2024.parquet")
 
 
 def load_sample_data() -> pd.DataFrame:
-    """Load sample market data for testing."""
+    """
+    Load sample market data for testing.
+    
+    The download is cached as parquet; set QUANTFORGE_REFRESH=1 to refetch.
+    """
+    if SAMPLE_DATA_CACHE.exists() and os.getenv("QUANTFORGE_REFRESH") != "1":
+        df = pd.read_parquet(SAMPLE_DATA_CACHE)
+        print(f"✓ Loaded {len(df)} days of cached data from {SAMPLE_DATA_CACHE}")
+        return df
+    
     import yfinance as yf
     
     print("Downloading sample data (SPY 2020-2024)...")
@@ -95,4 +144,7 @@ def load_sample_data() -> pd.DataFrame:
         df = df.rename(columns={'adj_close': 'close'})
     
     print(f"✓ Downloaded {len(df)} days of data")
+    
+    SAMPLE_DATA_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(SAMPLE_DATA_CACHE, engine='pyarrow', compression='zstd')
     return df
@@ -22,17 +22,20 @@ class ExecutionModel:
         self.slippage_pct = slippage_pct
         self.market_impact_coeff = market_impact_coeff
     
-    def estimate_cost(self, notional: float, volume_pct: float = 0.01) -> float:
+    def estimate_cost(self, notional, volume_pct=0.01):
         """
         Estimate total execution cost (one-way).
         
         Parameters:
-            notional: Dollar amount being traded
-            volume_pct: Trade size as % of daily volume
+            notional: Dollar amount being traded (scalar or array)
+            volume_pct: Trade size as % of daily volume (scalar or array)
         
         Returns:
-            Estimated cost in dollars
+            Estimated cost in dollars; an array if any input is an array
         """
+        notional = np.asarray(notional, dtype=np.float64)
+        volume_pct = np.asarray(volume_pct, dtype=np.float64)
+        
         # Bid-ask spread
         spread_cost = notional * (self.base_spread_bps / 10_000)
         
@@ -43,18 +46,29 @@ class ExecutionModel:
         impact_cost = notional * self.market_impact_coeff * np.sqrt(volume_pct)
         
         total_cost = spread_cost + slippage_cost + impact_cost
-        return total_cost
+        return float(total_cost) if total_cost.ndim == 0 else total_cost
+    
+    def estimate_cost_vector(self, notional: np.ndarray, volume_pct=0.01) -> np.ndarray:
+        """Estimate per-bar execution costs for an array of trade notionals."""
+        return np.atleast_1d(self.estimate_cost(notional, volume_pct))
     
-    def get_cost_breakdown(self, notional: float, volume_pct: float = 0.01) -> Dict[str, float]:
-        """Return detailed cost breakdown."""
+    def get_cost_breakdown(self, notional, volume_pct=0.01) -> Dict[str, float]:
+        """Return detailed cost breakdown (scalars, or arrays for array inputs)."""
+        notional = np.asarray(notional, dtype=np.float64)
+        volume_pct = np.asarray(volume_pct, dtype=np.float64)
+        
         spread_cost = notional * (self.base_spread_bps / 10_000)
         slippage_cost = notional * self.slippage_pct
         impact_cost = notional * self.market_impact_coeff * np.sqrt(volume_pct)
+        total_cost = spread_cost + slippage_cost + impact_cost
         
-        return {
+        breakdown = {
             'spread_cost': spread_cost,
             'slippage_cost': slippage_cost,
             'impact_cost': impact_cost,
-            'total_cost': spread_cost + slippage_cost + impact_cost,
-            'total_bps': ((spread_cost + slippage_cost + impact_cost) / notional) * 10_000
+            'total_cost': total_cost,
+            'total_bps': (total_cost / notional) * 10_000
         }
+        if notional.ndim == 0 and volume_pct.ndim == 0:
+            return {k: float(v) for k, v in breakdown.items()}
+        return breakdown
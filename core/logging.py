@@ -31,15 +31,17 @@ def log_backtest_results(config: Dict, metrics: Dict, artifacts_path: Optional[s
         metrics: Performance metrics dict
         artifacts_path: Optional path to artifacts (plots, CSVs)
     """
-    # Log configuration as parameters
-    for key, value in config.items():
-        if isinstance(value, (int, float, str, bool)):
-            mlflow.log_param(key, value)
+    # Log configuration as parameters (one batched request)
+    params = {key: value for key, value in config.items()
+              if isinstance(value, (int, float, str, bool))}
+    if params:
+        mlflow.log_params(params)
     
-    # Log metrics
-    for metric_name, metric_value in metrics.items():
-        if isinstance(metric_value, (int, float)):
-            mlflow.log_metric(metric_name, metric_value)
+    # Log metrics (one batched request)
+    metric_values = {name: float(value) for name, value in metrics.items()
+                     if isinstance(value, (int, float))}
+    if metric_values:
+        mlflow.log_metrics(metric_values)
     
     # Log artifacts if provided
     if artifacts_path:
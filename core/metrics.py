@@ -1,5 +1,6 @@
 """Performance and risk metrics with CVaR focus."""
 
+import math
 import numpy as np
 import pandas as pd
 from typing import Dict
@@ -10,18 +11,25 @@ def compute_cvar(returns: np.ndarray, alpha: float = 0.95) -> float:
     Compute Conditional Value-at-Risk (Expected Shortfall).
     
     CVaR = average of worst (1-alpha)% returns
+    
+    Uses an O(N) partial partition rather than a full sort. The tail holds
+    the ceil((1-alpha)*N) smallest returns; ties at the VaR boundary are
+    resolved by partition order.
     """
-    var_threshold = np.percentile(returns, (1 - alpha) * 100)
-    cvar = returns[returns <= var_threshold].mean()
-    return cvar
+    r = np.asarray(returns, dtype=np.float64)
+    if r.size == 0:
+        return np.nan
+    k = max(1, int(math.ceil(round((1 - alpha) * r.size, 9))))
+    tail = np.partition(r, k - 1)[:k]
+    return float(tail.mean())
 
 
-def compute_max_drawdown(equity_curve: pd.Series) -> float:
+def compute_max_drawdown(equity_curve: np.ndarray) -> float:
     """Compute maximum drawdown."""
-    running_max = equity_curve.expanding().max()
-    drawdowns = (equity_curve - running_max) / running_max
-    max_dd = drawdowns.min()
-    return max_dd
+    equity = np.asarray(equity_curve, dtype=np.float64)
+    running_max = np.maximum.accumulate(equity)
+    drawdowns = (equity - running_max) / running_max
+    return float(drawdowns.min())
 
 
 def portfolio_metrics(returns: pd.Series, risk_free_rate: float = 0.02) -> Dict[str, float]:
@@ -32,33 +40,41 @@ def portfolio_metrics(returns: pd.Series, risk_free_rate: float = 0.02) -> Dict[
     """
     # Annualization
     periods_per_year = 252
+    ann_factor = np.sqrt(periods_per_year)
+    
+    # Single conversion; all statistics below run on the float64 array
+    # (NaN dropped once, as pandas' skipna reductions did)
+    r = returns.to_numpy(dtype=np.float64)
+    r = r[~np.isnan(r)]
+    n = r.size
     
-    # Basic metrics
-    annual_return = returns.mean() * periods_per_year
-    annual_vol = returns.std() * np.sqrt(periods_per_year)
+    # Basic metrics (sample std, ddof=1, matching pandas)
+    mean = r.mean()
+    annual_return = mean * periods_per_year
+    annual_vol = r.std(ddof=1) * ann_factor if n > 1 else np.nan
     
     # Sharpe ratio
     excess_return = annual_return - risk_free_rate
     sharpe_ratio = excess_return / annual_vol if annual_vol > 0 else 0
     
     # Sortino ratio
-    downside_returns = returns[returns < 0]
-    downside_std = downside_returns.std() * np.sqrt(periods_per_year)
+    downside_returns = r[r < 0]
+    downside_std = downside_returns.std(ddof=1) * ann_factor if downside_returns.size > 1 else np.nan
     sortino_ratio = excess_return / downside_std if downside_std > 0 else 0
     
     # CVaR
-    cvar_95 = compute_cvar(returns.values, alpha=0.95)
-    cvar_99 = compute_cvar(returns.values, alpha=0.99)
+    cvar_95 = compute_cvar(r, alpha=0.95)
+    cvar_99 = compute_cvar(r, alpha=0.99)
     
     # Maximum drawdown
-    equity_curve = (1 + returns).cumprod()
+    equity_curve = np.cumprod(1.0 + r)
     max_drawdown = compute_max_drawdown(equity_curve)
     
     # Calmar ratio
     calmar_ratio = annual_return / abs(max_drawdown) if max_drawdown != 0 else 0
     
     # Additional metrics
-    win_rate = (returns > 0).sum() / len(returns)
+    win_rate = np.count_nonzero(r > 0) / n
     
     return {
         'annual_return': annual_return,
@@ -70,5 +86,5 @@ def portfolio_metrics(returns: pd.Series, risk_free_rate: float = 0.02) -> Dict[
         'cvar_95': cvar_95,
         'cvar_99': cvar_99,
         'win_rate': win_rate,
-        'total_periods': len(returns)
+        'total_periods': n
     }
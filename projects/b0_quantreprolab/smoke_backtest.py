@@ -24,15 +24,13 @@ from core import (
 )
 
 
-def simple_momentum_signal(prices: pd.DataFrame, lookback: int = 20) -> float:
-    """Simple momentum signal: buy if price > MA(20)."""
-    if len(prices) < lookback:
-        return 0.0
+def vector_momentum_weights(prices: pd.DataFrame, lookback: int = 20) -> np.ndarray:
+    """Simple momentum signal: long (1.0) when price > MA(20), else flat."""
+    close = prices['close']
+    ma = close.rolling(lookback, min_periods=lookback).mean()
     
-    current_price = prices['close'].iloc[-1]
-    ma = prices['close'].iloc[-lookback:].mean()
-    
-    return 1.0 if current_price > ma else 0.0
+    # Warm-up bars have a NaN MA, which compares False -> flat
+    return (close.to_numpy() > ma.to_numpy()).astype(np.float64)
 
 
 def run_smoke_backtest():
@@ -64,8 +62,7 @@ def run_smoke_backtest():
     
     results = backtester.run(
         prices=prices,
-        signal_func=lambda p: simple_momentum_signal(p, lookback=20),
-        weights_func=lambda s: s  # Weight = signal (0 or 1)
+        vector_signal_func=lambda p: vector_momentum_weights(p, lookback=20)  # Weight = signal (0 or 1)
     )
     
     print(f"✓ Backtest complete")
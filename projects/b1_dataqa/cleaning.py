@@ -7,25 +7,37 @@ logger = logging.getLogger(__name__)
 
 
 class DataCleaner:
+    """
+    Chainable cleaning steps over a long-format (date, ticker) market frame.
+    
+    The input frame is not copied: its date and ticker columns are converted
+    in place, and every later step works on the re-sorted frame built here.
+    """
+    
     def __init__(self, market_data: pd.DataFrame, config: dict):
-        self.data = market_data.copy()
+        self.data = market_data
         self.config = config
         self.cleaning_report = {}
         
         if 'date' in self.data.columns:
             self.data['date'] = pd.to_datetime(self.data['date'])
+        
+        # Integer-coded tickers make groupby/dedup/sort skip string hashing
+        if 'ticker' in self.data.columns:
+            self.data['ticker'] = self.data['ticker'].astype('category')
+        
+        # Sort once; per-ticker fills and returns rely on date order
+        if 'ticker' in self.data.columns and 'date' in self.data.columns:
+            self.data = self.data.sort_values(['ticker', 'date'], kind='stable')
     
     def handle_missing_values(self):
         """Fill small gaps, remove rows with critical missing data"""
         logger.info("🧹 Handling missing values...")
         initial_nulls = self.data.isnull().sum().sum()
         
-        # Forward fill by ticker (max 5 days)
-        for ticker in self.data['ticker'].unique():
-            mask = self.data['ticker'] == ticker
-            for col in ['close', 'open', 'high', 'low']:
-                if col in self.data.columns:
-                    self.data.loc[mask, col] = self.data.loc[mask, col].ffill(limit=5)
+        # Forward fill by ticker (max 5 days), in date order
+        cols = [c for c in ('close', 'open', 'high', 'low') if c in self.data.columns]
+        self.data.loc[:, cols] = self.data.groupby('ticker', sort=False, observed=True)[cols].ffill(limit=5)
         
         # Drop remaining nulls
         self.data = self.data.dropna(subset=['close'])
@@ -42,7 +54,13 @@ class DataCleaner:
         """Remove duplicate date-ticker entries"""
         logger.info("🧹 Removing duplicates...")
         initial = len(self.data)
-        self.data = self.data.drop_duplicates(subset=['date', 'ticker'], keep='last')
+        
+        # Pack (ticker code, date in seconds) into one int64 key and hash that
+        codes = self.data['ticker'].cat.codes.to_numpy().astype(np.int64)
+        seconds = self.data['date'].to_numpy(dtype='datetime64[s]').astype(np.int64)
+        key = (codes << 40) + seconds
+        keep_last = ~pd.Series(key).duplicated(keep='last').to_numpy()
+        self.data = self.data.iloc[keep_last]
         removed = initial - len(self.data)
         
         self.cleaning_report['duplicates'] = int(removed)
@@ -52,13 +70,17 @@ class DataCleaner:
     def detect_outliers(self):
         """Flag outliers using IQR method"""
         logger.info("🔍 Detecting outliers...")
-        self.data = self.data.sort_values(['ticker', 'date'])
-        self.data['returns'] = self.data.groupby('ticker')['close'].pct_change()
+        # Prices may be stored as float32; compute returns in float64
+        close = self.data['close'].astype(np.float64)
+        self.data['returns'] = close.groupby(self.data['ticker'], sort=False, observed=True).pct_change()
         
-        Q1 = self.data['returns'].quantile(0.25)
-        Q3 = self.data['returns'].quantile(0.75)
+        # Per-ticker IQR bounds, broadcast back to rows
+        grouped = self.data.groupby('ticker', sort=False, observed=True)['returns']
+        Q1 = grouped.transform('quantile', 0.25).to_numpy()
+        Q3 = grouped.transform('quantile', 0.75).to_numpy()
         IQR = Q3 - Q1
-        outliers = (self.data['returns'] < Q1 - 3*IQR) | (self.data['returns'] > Q3 + 3*IQR)
+        returns = self.data['returns'].to_numpy()
+        outliers = (returns < Q1 - 3*IQR) | (returns > Q3 + 3*IQR)
         
         self.data['is_outlier'] = outliers
         self.cleaning_report['outliers'] = {'count': int(outliers.sum())}
@@ -68,9 +90,10 @@ class DataCleaner:
     def validate_ohlc_relationships(self):
         """Check High >= Low, etc."""
         logger.info("🔍 Validating OHLC...")
-        violations = ((self.data['high'] < self.data['low']) | 
-                     (self.data['high'] < self.data['close']) |
-                     (self.data['low'] > self.data['close'])).sum()
+        high = self.data['high'].to_numpy()
+        low = self.data['low'].to_numpy()
+        close = self.data['close'].to_numpy()
+        violations = int(np.count_nonzero((high < low) | (high < close) | (low > close)))
         
         self.cleaning_report['ohlc_violations'] = int(violations)
         logger.info(f"  ✓ OHLC violations: {violations}")
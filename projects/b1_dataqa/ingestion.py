@@ -1,14 +1,32 @@
 """B1 Data Ingestion - Downloads market data from yFinance and FRED"""
 import yfinance as yf
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from pathlib import Path
 from typing import List, Tuple
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from fredapi import Fred
 import os
 
 logger = logging.getLogger(__name__)
 
+SP500_CACHE_PATH = Path('data/sp500_tickers.parquet')
+SP500_CACHE_TTL_SECONDS = 7 * 86400
+
+# Target dtypes for per-ticker frames, so the final concat is a plain block stack.
+# Prices carry ~6 significant digits, so float32 loses nothing and halves memory.
+MARKET_DTYPES = {
+    'open': 'float32',
+    'high': 'float32',
+    'low': 'float32',
+    'close': 'float32',
+    'volume': 'int64',
+}
+PRICE_COLUMNS = ['open', 'high', 'low', 'close']
+
 
 class MarketDataIngestion:
     def __init__(self, config: dict):
@@ -20,7 +38,13 @@ class MarketDataIngestion:
         self.fred = Fred(api_key=self.fred_api_key) if self.fred_api_key else None
         
     def get_sp500_tickers(self, limit: int = 100) -> List[str]:
-        """Get SP500 ticker list from Wikipedia"""
+        """Get SP500 ticker list from Wikipedia (cached on disk for a week)"""
+        if (SP500_CACHE_PATH.exists() and
+                SP500_CACHE_PATH.stat().st_mtime > time.time() - SP500_CACHE_TTL_SECONDS):
+            tickers = pd.read_parquet(SP500_CACHE_PATH)['ticker'].tolist()
+            logger.info(f"✓ Loaded {len(tickers)} cached tickers from {SP500_CACHE_PATH}")
+            return tickers[:limit]
+        
         logger.info("Fetching SP500 tickers...")
         try:
             url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
@@ -28,6 +52,9 @@ class MarketDataIngestion:
             tickers = tables[0]['Symbol'].tolist()
             tickers = [t.replace('.', '-') for t in tickers]
             logger.info(f"✓ Found {len(tickers)} tickers")
+            
+            SP500_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            pd.DataFrame({'ticker': tickers}).to_parquet(SP500_CACHE_PATH, index=False)
             return tickers[:limit]
         except Exception as e:
             logger.warning(f"Wikipedia failed, using backup list: {e}")
@@ -63,72 +90,132 @@ class MarketDataIngestion:
             tickers = self.get_sp500_tickers(limit=10)
         
         logger.info(f"📥 Downloading {len(tickers)} tickers from {self.start_date.date()} to {self.end_date.date()}...")
-        all_data = []
-        failed_tickers = []
+        try:
+            market_data = self._download_batch(tickers)
+        except Exception as e:
+            logger.warning(f"Batch download failed ({e}), falling back to per-ticker requests")
+            market_data = pd.DataFrame()
         
-        for i, ticker in enumerate(tickers, 1):
-            try:
-                logger.info(f"  [{i}/{len(tickers)}] {ticker}")
-                
-                # Download using Ticker with datetime objects
-                stock = yf.Ticker(ticker)
-                data = stock.history(start=self.start_date, end=self.end_date)
+        if market_data.empty:
+            market_data = self._download_per_ticker(tickers)
+        
+        if market_data.empty:
+            raise ValueError("No data downloaded! Check your internet connection.")
+        
+        # Group rows by ticker in the requested order, then by date
+        rank = market_data['ticker'].map({ticker: i for i, ticker in enumerate(tickers)})
+        market_data = market_data.iloc[np.lexsort((market_data['date'], rank))].reset_index(drop=True)
+        market_data['ticker'] = market_data['ticker'].astype('category')
+        market_data[PRICE_COLUMNS] = market_data[PRICE_COLUMNS].astype(np.float32)
+        
+        counts = market_data['ticker'].value_counts()
+        failed_tickers = [t for t in tickers if counts.get(t, 0) == 0]
+        for ticker in tickers:
+            if ticker in failed_tickers:
+                logger.warning(f"  ⚠ {ticker}: No data returned")
+            else:
+                logger.info(f"  ✓ {ticker}: {counts[ticker]} records")
+        
+        n_ok = len(tickers) - len(failed_tickers)
+        logger.info(f"✓ Downloaded {len(market_data)} total records from {n_ok} tickers")
+        
+        if failed_tickers:
+            logger.warning(f"⚠ Failed tickers: {', '.join(failed_tickers)}")
+        
+        return market_data
+    
+    def _download_batch(self, tickers: List[str]) -> pd.DataFrame:
+        """Fetch all tickers with one multi-symbol yf.download call"""
+        raw = yf.download(
+            tickers,
+            start=self.start_date,
+            end=self.end_date,
+            group_by='ticker',
+            auto_adjust=True,
+            actions=True,
+            threads=True,
+            progress=False,
+        )
+        
+        if raw is None or raw.empty:
+            return pd.DataFrame()
+        
+        # Wide (field per ticker) -> long format, one row per date-ticker
+        market_data = (
+            raw.stack(level=0, future_stack=True)
+               .rename_axis(['date', 'ticker'])
+               .reset_index()
+        )
+        market_data.columns = [str(col).lower().replace(' ', '_') for col in market_data.columns]
+        return market_data.dropna(subset=['open', 'high', 'low', 'close', 'volume'], how='all')
+    
+    def _download_per_ticker(self, tickers: List[str], max_workers: int = 16) -> pd.DataFrame:
+        """Fallback: one Ticker.history request per symbol on a thread pool"""
+        def fetch(ticker):
+            return yf.Ticker(ticker).history(start=self.start_date, end=self.end_date)
+        
+        all_data = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(fetch, ticker): ticker for ticker in tickers}
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    data = future.result()
+                except Exception as e:
+                    logger.error(f"  ✗ {ticker}: {e}")
+                    continue
                 
                 if len(data) == 0:
-                    logger.warning(f"  ⚠ {ticker}: No data returned")
-                    failed_tickers.append(ticker)
                     continue
                 
-                # Add ticker column
+                # Add ticker column (tz-naive dates, as in the batch path)
                 data['ticker'] = ticker
-                data['date'] = data.index
+                data['date'] = data.index.tz_localize(None) if data.index.tz is not None else data.index
                 data = data.reset_index(drop=True)
                 
                 # Standardize column names
                 data.columns = [col.lower().replace(' ', '_') for col in data.columns]
-                
+                data = data.astype({c: t for c, t in MARKET_DTYPES.items() if c in data.columns})
                 all_data.append(data)
-                logger.info(f"  ✓ {ticker}: {len(data)} records")
-                
-            except Exception as e:
-                logger.error(f"  ✗ {ticker}: {e}")
-                failed_tickers.append(ticker)
         
         if not all_data:
-            raise ValueError("No data downloaded! Check your internet connection.")
-        
-        market_data = pd.concat(all_data, ignore_index=True)
-        logger.info(f"✓ Downloaded {len(market_data)} total records from {len(all_data)} tickers")
-        
-        if failed_tickers:
-            logger.warning(f"⚠ Failed tickers: {', '.join(failed_tickers)}")
-        
-        return market_data
+            return pd.DataFrame()
+        return pd.concat(all_data, ignore_index=True)
     
-    def download_macro_data(self) -> pd.DataFrame:
+    def download_macro_data(self, max_workers: int = 8) -> pd.DataFrame:
         """Download macro data from FRED"""
         if not self.fred:
             logger.warning("FRED API not available")
             return pd.DataFrame()
         
         logger.info("📥 Downloading FRED data...")
-        macro_data = {}
         
         # Convert start date to string for FRED API
         start_str = self.start_date.strftime('%Y-%m-%d')
         end_str = self.end_date.strftime('%Y-%m-%d')
         
-        for series in self.config['data_sources']['fred']['series']:
-            try:
-                data = self.fred.get_series(
-                    series['code'], 
-                    observation_start=start_str,
-                    observation_end=end_str
-                )
-                macro_data[series['name']] = data
-                logger.info(f"  ✓ {series['name']}: {len(data)} records")
-            except Exception as e:
-                logger.error(f"  ✗ {series['name']}: {e}")
+        def fetch(series):
+            return self.fred.get_series(
+                series['code'],
+                observation_start=start_str,
+                observation_end=end_str
+            )
+        
+        # One HTTP request per series: overlap them, keep config order for the columns
+        series_list = self.config['data_sources']['fred']['series']
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(series_list)))) as executor:
+            futures = {executor.submit(fetch, series): series['name'] for series in series_list}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                    logger.info(f"  ✓ {name}: {len(results[name])} records")
+                except Exception as e:
+                    logger.error(f"  ✗ {name}: {e}")
+        
+        macro_data = {series['name']: results[series['name']]
+                      for series in series_list if series['name'] in results}
         
         if macro_data:
             df = pd.DataFrame(macro_data)
@@ -148,11 +235,22 @@ class MarketDataIngestion:
         market_path = f"data/market/market_raw_{version_date}.parquet"
         macro_path = f"data/macro/macro_raw_{version_date}.parquet"
         
-        market_data.to_parquet(market_path, compression='snappy', index=False)
+        # Ticker repeats on every row: store as dictionary-encoded category
+        market_data = market_data.assign(ticker=market_data['ticker'].astype('category'))
+        market_data.to_parquet(
+            market_path,
+            engine='pyarrow',
+            compression='zstd',
+            compression_level=3,
+            use_dictionary=['ticker'],
+            row_group_size=200_000,
+            index=False,
+        )
         logger.info(f"  💾 Market: {market_path}")
         
         if len(macro_data) > 0:
-            macro_data.to_parquet(macro_path, compression='snappy', index=False)
+            macro_data.to_parquet(macro_path, engine='pyarrow', compression='zstd',
+                                  compression_level=3, index=False)
             logger.info(f"  💾 Macro: {macro_path}")
         
         logger.info(f"✓ Saved raw snapshots: {version_date}")
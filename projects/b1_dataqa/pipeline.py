@@ -6,13 +6,21 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from projects.b1_dataqa.ingestion import MarketDataIngestion
 from projects.b1_dataqa.cleaning import DataCleaner
 from projects.b1_dataqa.qa_checks import DataQAValidator
+from core.config import load_yaml_cached
 
+import numpy as np
 import pandas as pd
-import yaml
+import pyarrow as pa
+import pyarrow.parquet as pq
 import json
 import logging
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s | %(levelname)s | %(message)s'
@@ -20,13 +28,17 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _json_default(o):
+    """Report values JSON has no type for: NumPy scalars unwrapped, anything else as str"""
+    return o.item() if isinstance(o, np.generic) else str(o)
+
+
 class B1DataPipeline:
     def __init__(self, config_path: str = None):
         if config_path is None:
             config_path = "projects/b1_dataqa/configs/b1_config.yaml"
         
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        self.config = load_yaml_cached(config_path)
         
         self.version_date = datetime.now().strftime('%Y%m%d')
     
@@ -93,8 +105,13 @@ class B1DataPipeline:
         # Save QA report
         report_path = f"projects/b1_dataqa/outputs/qa_reports/qa_{self.version_date}.json"
         os.makedirs(os.path.dirname(report_path), exist_ok=True)
-        with open(report_path, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
+        if orjson is not None:
+            with open(report_path, 'wb') as f:
+                f.write(orjson.dumps(report, default=_json_default,
+                                     option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            with open(report_path, 'w') as f:
+                json.dump(report, f, indent=2, default=_json_default)
         logger.info(f"📄 QA report: {report_path}")
         
         return passed, report
@@ -103,7 +120,19 @@ class B1DataPipeline:
         """Save final data"""
         # Save clean data
         clean_path = f"data/market/market_clean_{self.version_date}.parquet"
-        market_data.to_parquet(clean_path, compression='snappy', index=False)
+        storage = self.config.get('storage', {})
+        compression = storage.get('compression', 'zstd')
+        compression_level = storage.get('compression_level', 1 if compression == 'zstd' else None)
+        pq.write_table(
+            pa.Table.from_pandas(market_data, preserve_index=False),
+            clean_path,
+            compression=compression,
+            compression_level=compression_level,
+            row_group_size=131072,
+            use_dictionary=True,
+            data_page_size=1 << 20,
+            write_statistics=True,
+        )
         logger.info(f"✓ Saved: {clean_path}")
         
         # Save manifest
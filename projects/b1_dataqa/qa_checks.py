@@ -1,4 +1,5 @@
 """B1 QA Checks - Validate data quality"""
+import numpy as np
 import pandas as pd
 import logging
 
@@ -6,8 +7,14 @@ logger = logging.getLogger(__name__)
 
 
 class DataQAValidator:
+    """
+    Read-only quality checks over a cleaned market frame.
+    
+    The frame is held by reference, not copied; no check mutates it.
+    """
+    
     def __init__(self, data: pd.DataFrame, config: dict):
-        self.data = data.copy()
+        self.data = data
         self.config = config
         self.qa_report = {
             'timestamp': pd.Timestamp.now().isoformat(),
@@ -17,7 +24,13 @@ class DataQAValidator:
     def check_null_values(self):
         """Check for null values"""
         logger.info("  [1/3] Checking nulls...")
-        nulls = self.data.isnull().sum().sum()
+        # Count per column; avoids building a full boolean frame
+        nulls = 0
+        for _, values in self.data.items():
+            if isinstance(values.dtype, np.dtype) and values.dtype.kind == 'f':
+                nulls += int(np.count_nonzero(np.isnan(values.to_numpy())))
+            else:
+                nulls += int(values.isna().sum())
         threshold = self.config['quality_checks']['missing_data']['threshold']
         null_pct = nulls / (len(self.data) * len(self.data.columns))
         passed = null_pct <= threshold
@@ -47,7 +60,14 @@ class DataQAValidator:
     def check_data_coverage(self):
         """Check data coverage"""
         logger.info("  [3/3] Checking coverage...")
-        coverage = self.data.groupby('ticker').size()
+        # Tickers arrive categorical from ingestion/cleaning: count integer codes
+        tickers = self.data['ticker']
+        if isinstance(tickers.dtype, pd.CategoricalDtype):
+            codes = tickers.cat.codes.to_numpy()
+            coverage = np.bincount(codes[codes >= 0])
+            coverage = coverage[coverage > 0]
+        else:
+            coverage = tickers.value_counts(sort=False).to_numpy()
         mean_cov = coverage.mean()
         
         self.qa_report['checks']['coverage'] = {
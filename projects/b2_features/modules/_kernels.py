@@ -0,0 +1,142 @@
+"""
+Numba Kernels for Feature Engines
+Per-ticker loops over contiguous segments of a (ticker, date)-sorted frame.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+def segment_bounds(tickers):
+    """
+    Start/end row offsets of each ticker's contiguous block.
+    
+    The frame must be sorted (or at least grouped) by ticker.
+    """
+    if hasattr(tickers, 'cat'):
+        keys = tickers.cat.codes.to_numpy()
+    else:
+        keys = tickers.to_numpy()
+    
+    n = len(keys)
+    if n == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    
+    change = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    starts = np.concatenate(([0], change)).astype(np.int64)
+    ends = np.concatenate((change, [n])).astype(np.int64)
+    
+    if len(starts) != tickers.nunique():
+        raise ValueError("Rows must be grouped by ticker (sort by ['ticker', 'date'])")
+    return starts, ends
+
+
+@njit(parallel=True, cache=True)
+def rsi_kernel(close, starts, ends, period, out):
+    """RSI from simple moving averages of gains/losses over `period` bars."""
+    for g in prange(starts.shape[0]):
+        s = starts[g]
+        e = ends[g]
+        gain = np.zeros(e - s)
+        loss = np.zeros(e - s)
+        for i in range(s + 1, e):
+            delta = close[i] - close[i - 1]
+            if delta > 0:
+                gain[i - s] = delta
+            elif delta < 0:
+                loss[i - s] = -delta
+        
+        for i in range(s, e):
+            j = i - s
+            if j < period - 1:
+                out[i] = np.nan
+                continue
+            sum_gain = 0.0
+            sum_loss = 0.0
+            for k in range(j - period + 1, j + 1):
+                sum_gain += gain[k]
+                sum_loss += loss[k]
+            if sum_loss == 0.0:
+                out[i] = np.nan if sum_gain == 0.0 else 100.0
+            else:
+                rs = sum_gain / sum_loss
+                out[i] = 100.0 - 100.0 / (1.0 + rs)
+
+
+@njit(parallel=True, cache=True)
+def obv_kernel(close, volume, starts, ends, out):
+    """On-Balance Volume: running sum of volume signed by the close direction."""
+    for g in prange(starts.shape[0]):
+        s = starts[g]
+        e = ends[g]
+        obv = 0.0
+        out[s] = 0.0
+        for i in range(s + 1, e):
+            step = (close[i] - close[i - 1]) * volume[i]
+            if not np.isnan(step):
+                if close[i] > close[i - 1]:
+                    obv += volume[i]
+                elif close[i] < close[i - 1]:
+                    obv -= volume[i]
+            out[i] = obv
+
+
+@njit(cache=True)
+def _welford_update(val, sign, k, nobs, mean, ssq, comp):
+    """Add (sign=1) or remove (sign=-1) one value, Kahan-compensated like pandas' roll_var."""
+    nobs[k] += sign
+    if nobs[k] == 0:
+        mean[k] = 0.0
+        ssq[k] = 0.0
+        return
+    prev_mean = mean[k] - comp[k]
+    y = val - comp[k]
+    t = y - mean[k]
+    comp[k] = t + mean[k] - y
+    mean[k] += sign * t / nobs[k]
+    ssq[k] += sign * (val - prev_mean) * (val - mean[k])
+
+
+@njit(parallel=True, cache=True)
+def rolling_std_kernel(values, starts, ends, windows, out):
+    """
+    Rolling sample std (ddof=1) at several windows in one pass per ticker.
+    
+    Online Welford updates per window; a row gets a value only once its full
+    window is non-NaN, and exactly 0.0 when that window is constant (as pandas).
+    """
+    n_win = windows.shape[0]
+    for g in prange(starts.shape[0]):
+        s = starts[g]
+        e = ends[g]
+        nobs = np.zeros(n_win, dtype=np.int64)
+        mean = np.zeros(n_win)
+        ssq = np.zeros(n_win)
+        comp_add = np.zeros(n_win)
+        comp_remove = np.zeros(n_win)
+        n_same = 0
+        for i in range(s, e):
+            x = values[i]
+            valid = not np.isnan(x)
+            if valid and i > s and x == values[i - 1]:
+                n_same += 1
+            elif valid:
+                n_same = 1
+            else:
+                n_same = 0
+            
+            for k in range(n_win):
+                w = windows[k]
+                if valid:
+                    _welford_update(x, 1, k, nobs, mean, ssq, comp_add)
+                if i - w >= s and not np.isnan(values[i - w]):
+                    _welford_update(values[i - w], -1, k, nobs, mean, ssq, comp_remove)
+                
+                if nobs[k] >= w and nobs[k] > 1:
+                    if n_same >= w:
+                        out[i, k] = 0.0
+                    else:
+                        out[i, k] = np.sqrt(max(ssq[k], 0.0) / (nobs[k] - 1))
+                else:
+                    out[i, k] = np.nan
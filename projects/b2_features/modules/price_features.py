@@ -7,9 +7,21 @@ import pandas as pd
 import numpy as np
 import logging
 
+from ._kernels import segment_bounds, rsi_kernel
+
 logger = logging.getLogger(__name__)
 
 
+def _is_sorted_by_ticker_date(df):
+    """True if rows are ordered by ticker, then by date within each ticker."""
+    if not df['ticker'].is_monotonic_increasing:
+        return False
+    tickers = df['ticker'].cat.codes.to_numpy() if hasattr(df['ticker'], 'cat') else df['ticker'].to_numpy()
+    dates = df['date'].to_numpy()
+    same_ticker = tickers[1:] == tickers[:-1]
+    return not np.any(same_ticker & (dates[1:] < dates[:-1]))
+
+
 class PriceFeaturesEngine:
     """Compute price-based features with walk-forward safety."""
     
@@ -22,20 +34,29 @@ class PriceFeaturesEngine:
         """Compute returns at multiple horizons."""
         logger.info("  Computing returns...")
         
-        # Sort by ticker and date (critical!)
-        df = df.sort_values(['ticker', 'date']).reset_index(drop=True)
+        # Sort by ticker and date (critical!) - load_data already does, so
+        # only pay for the sort when the O(N) order check fails
+        if not _is_sorted_by_ticker_date(df):
+            df = df.sort_values(['ticker', 'date'])
+        df = df.reset_index(drop=True)
+        
+        g = df.groupby('ticker', sort=False, observed=True)['close']
+        close = df['close'].to_numpy()
         
-        # Daily returns
-        df['returns_1d'] = df.groupby('ticker')['close'].pct_change()
+        # Daily returns (reuse the shared primitive when the pipeline provided it)
+        if '_returns_1d' in df.columns:
+            df['returns_1d'] = df['_returns_1d']
+        else:
+            df['returns_1d'] = close / g.shift(1).to_numpy() - 1
         
         # Weekly returns (5 days)
-        df['returns_5d'] = df.groupby('ticker')['close'].pct_change(5)
+        df['returns_5d'] = close / g.shift(5).to_numpy() - 1
         
         # Monthly returns (20 days)
-        df['returns_20d'] = df.groupby('ticker')['close'].pct_change(20)
+        df['returns_20d'] = close / g.shift(20).to_numpy() - 1
         
         # Momentum (60 days = ~3 months)
-        df['momentum_60d'] = df.groupby('ticker')['close'].pct_change(60)
+        df['momentum_60d'] = close / g.shift(60).to_numpy() - 1
         
         return df
     
@@ -43,11 +64,12 @@ class PriceFeaturesEngine:
         """Compute Simple Moving Averages (SMA)."""
         logger.info("  Computing moving averages...")
         
+        g = df.groupby('ticker', sort=False, observed=True)['close']
+        
         for window in self.windows:
             # SMA for each window
-            df[f'sma_{window}'] = df.groupby('ticker')['close'].transform(
-                lambda x: x.rolling(window=window, min_periods=window).mean()
-            )
+            df[f'sma_{window}'] = g.rolling(window=window, min_periods=window).mean() \
+                                   .reset_index(level=0, drop=True)
             
             # Price relative to SMA (mean reversion signal)
             df[f'price_to_sma_{window}'] = df['close'] / df[f'sma_{window}']
@@ -58,19 +80,11 @@ class PriceFeaturesEngine:
         """Compute Relative Strength Index (RSI)."""
         logger.info("  Computing RSI...")
         
-        def rsi_for_ticker(group):
-            delta = group['close'].diff()
-            gain = delta.where(delta > 0, 0)
-            loss = -delta.where(delta < 0, 0)
-            
-            avg_gain = gain.rolling(window=period, min_periods=period).mean()
-            avg_loss = loss.rolling(window=period, min_periods=period).mean()
-            
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            return rsi
-        
-        df['rsi_14'] = df.groupby('ticker', group_keys=False).apply(rsi_for_ticker).values
+        close = df['close'].to_numpy(dtype=np.float64)
+        starts, ends = segment_bounds(df['ticker'])
+        rsi = np.empty(len(df), dtype=np.float64)
+        rsi_kernel(close, starts, ends, period, rsi)
+        df['rsi_14'] = rsi
         
         return df
     
@@ -81,9 +95,10 @@ class PriceFeaturesEngine:
         """
         logger.info(f"  Applying {self.lag}-day lag for walk-forward safety...")
         
-        for col in feature_cols:
-            if col in df.columns:
-                df[col] = df.groupby('ticker')[col].shift(self.lag)
+        # One grouped shift over all feature columns instead of one scan per column
+        cols = [col for col in feature_cols if col in df.columns]
+        if cols:
+            df[cols] = df.groupby('ticker', sort=False, observed=True)[cols].shift(self.lag)
         
         return df
     
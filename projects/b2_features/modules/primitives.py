@@ -0,0 +1,22 @@
+"""
+Shared Feature Primitives
+Per-ticker building blocks computed once and read by several engines.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Private columns: engines read them when present, the pipeline drops them before saving
+PRIMITIVE_COLUMNS = ['_prev_close', '_returns_1d']
+
+
+def add_primitives(df):
+    """Add the previous close and unlagged 1-day return for each ticker."""
+    logger.info("PRIMITIVES: previous close, 1-day returns")
+    
+    prev_close = df.groupby('ticker', sort=False, observed=True)['close'].shift(1)
+    return df.assign(
+        _prev_close=prev_close,
+        _returns_1d=df['close'].to_numpy() / prev_close.to_numpy() - 1,
+    )
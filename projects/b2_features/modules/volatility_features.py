@@ -7,6 +7,8 @@ import pandas as pd
 import numpy as np
 import logging
 
+from ._kernels import segment_bounds, rolling_std_kernel
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,13 +25,19 @@ class VolatilityFeaturesEngine:
         
         # Need returns first
         if 'returns_1d' not in df.columns:
-            df['returns_1d'] = df.groupby('ticker')['close'].pct_change()
+            if '_returns_1d' in df.columns:
+                df['returns_1d'] = df['_returns_1d']
+            else:
+                df['returns_1d'] = df.groupby('ticker')['close'].pct_change()
         
-        # Rolling volatility at multiple windows (annualized)
-        for window in self.windows:
-            df[f'realized_vol_{window}d'] = df.groupby('ticker')['returns_1d'].transform(
-                lambda x: x.rolling(window=window, min_periods=window).std() * np.sqrt(252)
-            )
+        # Rolling volatility at all windows in one pass (annualized)
+        returns = df['returns_1d'].to_numpy(dtype=np.float64)
+        starts, ends = segment_bounds(df['ticker'])
+        windows = np.asarray(self.windows, dtype=np.int64)
+        rolling_std = np.empty((len(df), len(windows)), dtype=np.float64)
+        rolling_std_kernel(returns, starts, ends, windows, rolling_std)
+        for k, window in enumerate(self.windows):
+            df[f'realized_vol_{window}d'] = rolling_std[:, k] * np.sqrt(252)
         
         return df
     
@@ -39,25 +47,33 @@ class VolatilityFeaturesEngine:
         """
         logger.info("  Computing ATR...")
         
-        def atr_for_ticker(group):
-            high = group['high']
-            low = group['low']
-            close_prev = group['close'].shift(1)
-            
-            # True Range components
-            tr1 = high - low
-            tr2 = abs(high - close_prev)
-            tr3 = abs(low - close_prev)
-            
-            # True Range = max of the three
-            true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-            
-            # ATR = moving average of True Range
-            atr = true_range.rolling(window=period, min_periods=period).mean()
-            
-            return atr
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+        
+        # Previous close: shared primitive, or one whole-frame shift masked at ticker boundaries
+        if '_prev_close' in df.columns:
+            close_prev = df['_prev_close'].to_numpy(dtype=np.float64)
+        else:
+            starts, _ = segment_bounds(df['ticker'])
+            close_prev = np.empty_like(close)
+            close_prev[1:] = close[:-1]
+            close_prev[starts] = np.nan
+        
+        # True Range = max of the three (fmax skips NaN components), reusing buffers
+        gap_high = np.subtract(high, close_prev)
+        np.abs(gap_high, out=gap_high)
+        gap_low = np.subtract(low, close_prev)
+        np.abs(gap_low, out=gap_low)
+        true_range = np.subtract(high, low)
+        np.fmax(gap_high, gap_low, out=gap_high)
+        np.fmax(true_range, gap_high, out=true_range)
         
-        df['atr_14'] = df.groupby('ticker', group_keys=False).apply(atr_for_ticker).values
+        # ATR = moving average of True Range
+        df['atr_14'] = pd.Series(true_range, index=df.index) \
+                         .groupby(df['ticker'], sort=False, observed=True) \
+                         .rolling(window=period, min_periods=period).mean() \
+                         .reset_index(level=0, drop=True)
         
         return df
     
@@ -72,9 +88,11 @@ class VolatilityFeaturesEngine:
             df = self.compute_realized_volatility(df)
         
         # Volatility of the volatility
-        df['vol_of_vol'] = df.groupby('ticker')['realized_vol_20d'].transform(
-            lambda x: x.rolling(window=20, min_periods=20).std()
-        )
+        realized_vol = df['realized_vol_20d'].to_numpy(dtype=np.float64)
+        starts, ends = segment_bounds(df['ticker'])
+        vol_of_vol = np.empty((len(df), 1), dtype=np.float64)
+        rolling_std_kernel(realized_vol, starts, ends, np.array([20], dtype=np.int64), vol_of_vol)
+        df['vol_of_vol'] = vol_of_vol[:, 0]
         
         return df
     
@@ -7,6 +7,8 @@ import pandas as pd
 import numpy as np
 import logging
 
+from ._kernels import segment_bounds, obv_kernel
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,11 +23,12 @@ class VolumeFeaturesEngine:
         """Compute volume moving averages."""
         logger.info("  Computing volume averages...")
         
+        g = df.groupby('ticker', sort=False, observed=True)['volume']
+        
         for window in self.windows:
             # Volume SMA
-            df[f'volume_sma_{window}'] = df.groupby('ticker')['volume'].transform(
-                lambda x: x.rolling(window=window, min_periods=window).mean()
-            )
+            df[f'volume_sma_{window}'] = g.rolling(window=window, min_periods=window).mean() \
+                                          .reset_index(level=0, drop=True)
             
             # Volume ratio (current vs average)
             df[f'volume_ratio_{window}'] = df['volume'] / df[f'volume_sma_{window}']
@@ -39,9 +42,9 @@ class VolumeFeaturesEngine:
         df['dollar_volume'] = df['close'] * df['volume']
         
         # Dollar volume moving average
-        df['dollar_volume_sma_20'] = df.groupby('ticker')['dollar_volume'].transform(
-            lambda x: x.rolling(window=20, min_periods=20).mean()
-        )
+        df['dollar_volume_sma_20'] = df.groupby('ticker', sort=False, observed=True)['dollar_volume'] \
+                                       .rolling(window=20, min_periods=20).mean() \
+                                       .reset_index(level=0, drop=True)
         
         return df
     
@@ -51,19 +54,19 @@ class VolumeFeaturesEngine:
         """
         logger.info("  Computing On-Balance Volume...")
         
-        def obv_for_ticker(group):
-            # OBV increases on up days, decreases on down days
-            direction = np.sign(group['close'].diff())
-            obv = (direction * group['volume']).fillna(0).cumsum()
-            return obv
-        
-        df['obv'] = df.groupby('ticker', group_keys=False).apply(obv_for_ticker).values
+        # OBV increases on up days, decreases on down days
+        close = df['close'].to_numpy(dtype=np.float64)
+        volume = df['volume'].to_numpy(dtype=np.float64)
+        starts, ends = segment_bounds(df['ticker'])
+        obv = np.empty(len(df), dtype=np.float64)
+        obv_kernel(close, volume, starts, ends, obv)
+        df['obv'] = obv
         
         # Normalize OBV (different scales per ticker)
-        df['obv_normalized'] = df.groupby('ticker')['obv'].transform(
-            lambda x: (x - x.rolling(window=60, min_periods=60).mean()) / 
-                      x.rolling(window=60, min_periods=60).std()
-        )
+        rolling = df.groupby('ticker', sort=False, observed=True)['obv'].rolling(window=60, min_periods=60)
+        obv_mean = rolling.mean().reset_index(level=0, drop=True)
+        obv_std = rolling.std().reset_index(level=0, drop=True)
+        df['obv_normalized'] = (df['obv'] - obv_mean) / obv_std
         
         return df
     
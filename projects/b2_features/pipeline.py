@@ -7,17 +7,22 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
+import numpy as np
 import pandas as pd
-import yaml
 import json
 import logging
 from datetime import datetime
 from pathlib import Path
+from joblib import Parallel, delayed
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 # Import our feature engines
 from modules.price_features import PriceFeaturesEngine
 from modules.volatility_features import VolatilityFeaturesEngine
 from modules.volume_features import VolumeFeaturesEngine
+from modules.primitives import add_primitives, PRIMITIVE_COLUMNS
+from core.config import load_yaml_cached
 
 # Setup logging
 logging.basicConfig(
@@ -28,6 +33,28 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _compute_shard(df, config):
+    """Run the enabled feature engines over one shard of whole tickers."""
+    df = add_primitives(df)
+    if config['features']['price_momentum']['enabled']:
+        df = PriceFeaturesEngine(config).compute_all(df)
+    if config['features']['volatility']['enabled']:
+        df = VolatilityFeaturesEngine(config).compute_all(df)
+    if config['features']['volume']['enabled']:
+        df = VolumeFeaturesEngine(config).compute_all(df)
+    return df.drop(columns=PRIMITIVE_COLUMNS)
+
+
+def _ticker_shards(df, n_shards):
+    """Cut a ticker-sorted frame into at most n_shards contiguous whole-ticker slices."""
+    ticker_starts = np.flatnonzero(df['ticker'].ne(df['ticker'].shift()).to_numpy())
+    n_shards = max(1, min(n_shards, len(ticker_starts)))
+    if n_shards == 1:
+        return [df]
+    bounds = [chunk[0] for chunk in np.array_split(ticker_starts, n_shards)] + [len(df)]
+    return [df.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
 class B2FeaturePipeline:
     """Complete B2 pipeline: load → compute → validate → save."""
     
@@ -38,8 +65,7 @@ class B2FeaturePipeline:
     
     def _load_config(self, config_path):
         """Load YAML configuration."""
-        with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+        config = load_yaml_cached(config_path)
         logger.info(f"✓ Config loaded: {config_path}")
         return config
     
@@ -70,20 +96,19 @@ class B2FeaturePipeline:
         
         initial_cols = len(df.columns)
         
-        # Price features
-        if self.config['features']['price_momentum']['enabled']:
-            price_engine = PriceFeaturesEngine(self.config)
-            df = price_engine.compute_all(df)
+        # Every feature is within-ticker, so whole-ticker shards are independent.
+        # load_data sorts by ticker, so each shard is a contiguous row slice.
+        n_jobs = self.config.get('compute', {}).get('n_jobs', -1)
+        shards = _ticker_shards(df, os.cpu_count() if n_jobs == -1 else n_jobs)
         
-        # Volatility features
-        if self.config['features']['volatility']['enabled']:
-            vol_engine = VolatilityFeaturesEngine(self.config)
-            df = vol_engine.compute_all(df)
-        
-        # Volume features
-        if self.config['features']['volume']['enabled']:
-            volume_engine = VolumeFeaturesEngine(self.config)
-            df = volume_engine.compute_all(df)
+        if len(shards) == 1:
+            df = _compute_shard(df, self.config)
+        else:
+            logger.info(f"Computing {len(shards)} ticker shards in parallel")
+            results = Parallel(n_jobs=n_jobs, backend='loky')(
+                delayed(_compute_shard)(shard, self.config) for shard in shards
+            )
+            df = pd.concat(results, ignore_index=True)
         
         features_added = len(df.columns) - initial_cols
         logger.info(f"\n✓ Total features added: {features_added}")
@@ -105,12 +130,10 @@ class B2FeaturePipeline:
         
         # Check null percentages
         max_null_pct = self.config['quality']['max_null_pct']
-        failed_features = []
-        
-        for col in feature_cols:
-            null_pct = df[col].isnull().sum() / len(df)
-            if null_pct > max_null_pct:
-                failed_features.append(f"{col}: {null_pct:.2%}")
+        null_pcts = df[feature_cols].isna().to_numpy().mean(axis=0)
+        failed_mask = null_pcts > max_null_pct
+        failed_features = [f"{col}: {null_pct:.2%}" for col, null_pct
+                           in zip(np.array(feature_cols)[failed_mask], null_pcts[failed_mask])]
         
         if failed_features:
             logger.warning(f"⚠ {len(failed_features)} features exceed {max_null_pct*100}% null threshold")
@@ -141,19 +164,42 @@ class B2FeaturePipeline:
         version_date = datetime.now().strftime("%Y%m%d")
         output_path = output_dir / f"features_{version_date}.parquet"
         
-        df.to_parquet(output_path, compression='snappy')
+        feature_cols = [col for col in df.columns if col not in 
+                       ['date', 'ticker', 'open', 'high', 'low', 'close', 
+                        'volume', 'dividends', 'stock_splits']]
+        
+        # Features don't need double precision: halve memory and file size
+        float_cols = [col for col in feature_cols if df[col].dtype == np.float64]
+        df[float_cols] = df[float_cols].astype(np.float32)
+        
+        storage = self.config['storage']
+        compression = storage.get('compression', 'zstd')
+        compression_level = storage.get('compression_level', 1 if compression == 'zstd' else None)
+        pq.write_table(
+            pa.Table.from_pandas(df, preserve_index=False),
+            output_path,
+            compression=compression,
+            compression_level=compression_level,
+            row_group_size=131072,
+            use_dictionary=True,
+            data_page_size=1 << 20,
+            write_statistics=True,
+        )
         file_size_mb = output_path.stat().st_size / 1024 / 1024
         
+        # Optional Feather (Arrow IPC) copy for fast local re-reads during iteration;
+        # parquet stays the published format
+        if storage.get('intermediate_format') == 'feather':
+            feather_path = output_path.with_suffix('.feather')
+            df.reset_index(drop=True).to_feather(feather_path, compression='lz4')
+            logger.info(f"✓ Intermediate saved: {feather_path}")
+        
         logger.info(f"✓ Features saved: {output_path}")
         logger.info(f"  Size: {file_size_mb:.2f} MB")
         logger.info(f"  Records: {len(df):,}")
         logger.info(f"  Columns: {len(df.columns)}")
         
         # Create manifest
-        feature_cols = [col for col in df.columns if col not in 
-                       ['date', 'ticker', 'open', 'high', 'low', 'close', 
-                        'volume', 'dividends', 'stock_splits']]
-        
         manifest = {
             'version': f"features_{version_date}",
             'timestamp': datetime.now().isoformat(),
@@ -175,6 +221,118 @@ class B2FeaturePipeline:
         
         return str(output_path)
     
+    def stream_features(self, df):
+        """
+        Stages 2-4 fused: compute, check and append features one ticker at a time.
+        
+        Only one ticker's feature frame per worker is alive at once, so peak
+        memory is the input frame plus a few ticker-sized slices.
+        """
+        logger.info("\n" + "="*60)
+        logger.info("STAGES 2-4: STREAMING FEATURES PER TICKER")
+        logger.info("="*60)
+        
+        output_dir = Path(self.config['storage']['output_dir'])
+        output_dir.mkdir(parents=True, exist_ok=True)
+        version_date = datetime.now().strftime("%Y%m%d")
+        output_path = output_dir / f"features_{version_date}.parquet"
+        
+        storage = self.config['storage']
+        compression = storage.get('compression', 'zstd')
+        compression_level = storage.get('compression_level', 1 if compression == 'zstd' else None)
+        n_jobs = self.config.get('compute', {}).get('n_jobs', -1)
+        
+        initial_cols = len(df.columns)
+        shards = _ticker_shards(df, len(df))
+        results = Parallel(n_jobs=n_jobs, backend='loky', return_as='generator')(
+            delayed(_compute_shard)(shard, self.config) for shard in shards
+        )
+        
+        # Shards are buffered and written in full row groups, so the file has
+        # the same row-group layout as save_features rather than one per ticker
+        row_group_size = 131072
+        writer = None
+        pending = []
+        pending_rows = 0
+        null_counts = None
+        records = 0
+        try:
+            for shard in results:
+                feature_cols = [col for col in shard.columns if col not in
+                               ['date', 'ticker', 'open', 'high', 'low', 'close',
+                                'volume', 'dividends', 'stock_splits']]
+                float_cols = [col for col in feature_cols if shard[col].dtype == np.float64]
+                shard[float_cols] = shard[float_cols].astype(np.float32)
+                
+                table = pa.Table.from_pandas(shard, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(
+                        output_path,
+                        table.schema,
+                        compression=compression,
+                        compression_level=compression_level,
+                        use_dictionary=True,
+                        data_page_size=1 << 20,
+                    )
+                pending.append(table)
+                pending_rows += table.num_rows
+                if pending_rows >= row_group_size:
+                    buffered = pa.concat_tables(pending)
+                    full = pending_rows - pending_rows % row_group_size
+                    writer.write_table(buffered.slice(0, full), row_group_size=row_group_size)
+                    pending = [buffered.slice(full)]
+                    pending_rows -= full
+                
+                shard_nulls = shard[feature_cols].isna().sum()
+                null_counts = shard_nulls if null_counts is None else null_counts + shard_nulls
+                records += len(shard)
+            
+            if pending_rows:
+                writer.write_table(pa.concat_tables(pending), row_group_size=row_group_size)
+        finally:
+            if writer is not None:
+                writer.close()
+        
+        features_added = len(shard.columns) - initial_cols if writer is not None else 0
+        
+        # Null check over the accumulated per-ticker counts
+        max_null_pct = self.config['quality']['max_null_pct']
+        null_pcts = null_counts / records if records else pd.Series(dtype=float)
+        checked = null_pcts.drop(['returns', 'is_outlier'], errors='ignore')
+        failed = checked[checked > max_null_pct]
+        if len(failed):
+            logger.warning(f"⚠ {len(failed)} features exceed {max_null_pct*100}% null threshold")
+            for col, pct in failed.head(5).items():
+                logger.warning(f"  {col}: {pct:.2%}")
+        else:
+            logger.info(f"✓ All features pass null check (<{max_null_pct*100}%)")
+        
+        file_size_mb = output_path.stat().st_size / 1024 / 1024 if output_path.exists() else 0.0
+        logger.info(f"✓ Features saved: {output_path}")
+        logger.info(f"  Size: {file_size_mb:.2f} MB")
+        logger.info(f"  Records: {records:,}")
+        
+        manifest = {
+            'version': f"features_{version_date}",
+            'timestamp': datetime.now().isoformat(),
+            'records': records,
+            'tickers': int(df['ticker'].nunique()),
+            'features_count': len(null_pcts),
+            'features': list(null_pcts.index),
+            'date_range': {
+                'start': str(df['date'].min()),
+                'end': str(df['date'].max())
+            }
+        }
+        
+        manifest_path = output_dir / f"manifest_{version_date}.json"
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        
+        logger.info(f"✓ Manifest saved: {manifest_path}")
+        
+        return str(output_path), features_added
+    
     def run(self):
         """Execute complete pipeline."""
         try:
@@ -185,14 +343,18 @@ class B2FeaturePipeline:
             # Stage 1: Load
             df = self.load_data()
             
-            # Stage 2: Compute
-            df, features_added = self.compute_features(df)
-            
-            # Stage 3: Validate
-            self.validate_features(df)
-            
-            # Stage 4: Save
-            output_path = self.save_features(df, features_added)
+            if self.config['storage'].get('streaming', False):
+                # Stages 2-4, one ticker at a time
+                output_path, features_added = self.stream_features(df)
+            else:
+                # Stage 2: Compute
+                df, features_added = self.compute_features(df)
+                
+                # Stage 3: Validate
+                self.validate_features(df)
+                
+                # Stage 4: Save
+                output_path = self.save_features(df, features_added)
             
             # Success summary
             logger.info("\n" + "="*60)
@@ -0,0 +1,92 @@
+"""Numba-compiled inner loops for the B3 backtester."""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True)
+def run_backtest_kernel(date_ids, signal, ret, n_dates, commission, slippage, initial_cash):
+    """
+    Daily long/short portfolio returns and equity in one pass over the rows.
+    
+    Each leg earns the mean of its non-NaN next-day returns (shorts negated),
+    weighted by its share of positions; costs apply only on days with positions.
+    Rows with a negative date id are ignored.
+    """
+    n_long = np.zeros(n_dates, dtype=np.int64)
+    n_short = np.zeros(n_dates, dtype=np.int64)
+    sum_long = np.zeros(n_dates)
+    sum_short = np.zeros(n_dates)
+    cnt_long = np.zeros(n_dates, dtype=np.int64)
+    cnt_short = np.zeros(n_dates, dtype=np.int64)
+    
+    for i in range(date_ids.shape[0]):
+        d = date_ids[i]
+        if d < 0:
+            continue
+        if signal[i] == 1:
+            n_long[d] += 1
+            if not np.isnan(ret[i]):
+                sum_long[d] += ret[i]
+                cnt_long[d] += 1
+        elif signal[i] == -1:
+            n_short[d] += 1
+            if not np.isnan(ret[i]):
+                sum_short[d] += ret[i]
+                cnt_short[d] += 1
+    
+    equity = np.empty(n_dates)
+    net_return = np.zeros(n_dates)
+    current_equity = initial_cash
+    for d in range(n_dates):
+        total = n_long[d] + n_short[d]
+        if total > 0:
+            portfolio_return = 0.0
+            if cnt_long[d] > 0:
+                portfolio_return += (sum_long[d] / cnt_long[d]) * (n_long[d] / total)
+            if cnt_short[d] > 0:
+                portfolio_return += -(sum_short[d] / cnt_short[d]) * (n_short[d] / total)
+            net_return[d] = portfolio_return - commission - slippage
+            current_equity *= 1 + net_return[d]
+        equity[d] = current_equity
+    
+    return equity, net_return
+
+
+@njit(cache=True)
+def equity_metrics_kernel(returns, equity):
+    """
+    Return statistics and max drawdown in one pass over the series.
+    
+    NaN returns are skipped. Returns (n, mean, sample std, n_wins, max_drawdown);
+    the std (Welford) is NaN for fewer than two returns, as in pandas.
+    """
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    wins = 0
+    for i in range(returns.shape[0]):
+        r = returns[i]
+        if np.isnan(r):
+            continue
+        n += 1
+        delta = r - mean
+        mean += delta / n
+        m2 += delta * (r - mean)
+        if r > 0:
+            wins += 1
+    
+    std = np.sqrt(max(m2, 0.0) / (n - 1)) if n > 1 else np.nan
+    if n == 0:
+        mean = np.nan
+    
+    peak = -np.inf
+    max_dd = 0.0
+    for i in range(equity.shape[0]):
+        if equity[i] > peak:
+            peak = equity[i]
+        dd = (equity[i] - peak) / peak
+        if dd < max_dd:
+            max_dd = dd
+    
+    return n, mean, std, wins, max_dd
@@ -7,6 +7,8 @@ import numpy as np
 import yaml
 from datetime import datetime
 
+from _backtest_kernels import equity_metrics_kernel, run_backtest_kernel
+
 class SimpleBacktester:
     """Backtest a strategy and calculate returns"""
     
@@ -34,74 +36,54 @@ class SimpleBacktester:
         print("RUNNING BACKTEST")
         print("="*60)
         
-        df = signals_df.copy()
+        # Project the needed columns; no full copy of the signals frame.
+        # Integer-coded tickers: sort and group without hashing strings
+        df = signals_df[['date', 'ticker', 'close', 'signal']].assign(
+            ticker=lambda d: d['ticker'].astype('category')
+        )
         df = df.sort_values(['date', 'ticker'])
         
-        # Calculate daily returns for each ticker
-        df['next_close'] = df.groupby('ticker')['close'].shift(-1)
+        # Calculate daily returns for each ticker: walk rows in (ticker, date)
+        # order, take the next row's close, and mask it at ticker boundaries
+        codes = df['ticker'].cat.codes.to_numpy()
+        close = df['close'].to_numpy(dtype=np.float64)
+        order = np.lexsort((df['date'].to_numpy(), codes))
+        next_in_order = np.full(len(df), np.nan)
+        next_in_order[:-1] = close[order][1:]
+        next_in_order[:-1][codes[order][1:] != codes[order][:-1]] = np.nan
+        next_close = np.empty(len(df))
+        next_close[order] = next_in_order
+        next_close[codes < 0] = np.nan
+        df['next_close'] = next_close
         df['daily_return'] = (df['next_close'] / df['close']) - 1
         
-        # Group by date
-        dates = sorted(df['date'].unique())
+        # Per-date long/short aggregation and compounding in one compiled pass
+        # Rows are date-sorted (NaT last), so each date is one contiguous block:
+        # ids come from block boundaries instead of hashing every date
+        dates_arr = df['date'].to_numpy()
+        n_valid = int(df['date'].notna().sum())
+        new_block = np.ones(n_valid, dtype=bool)
+        new_block[1:] = dates_arr[1:n_valid] != dates_arr[:n_valid - 1]
+        date_ids = np.full(len(df), -1, dtype=np.int64)
+        date_ids[:n_valid] = np.cumsum(new_block) - 1
+        dates = pd.DatetimeIndex(dates_arr[:n_valid][new_block])
         print(f"✓ Backtesting {len(dates)} trading days")
         
-        # Track portfolio
-        equity_curve = []
-        current_equity = self.initial_cash
-        
-        for i, date in enumerate(dates):
-            day_data = df[df['date'] == date].copy()
-            
-            # Count positions
-            n_long = (day_data['signal'] == 1).sum()
-            n_short = (day_data['signal'] == -1).sum()
-            total_positions = n_long + n_short
-            
-            if total_positions == 0:
-                equity_curve.append({
-                    'date': date,
-                    'equity': current_equity,
-                    'return': 0.0
-                })
-                continue
-            
-            # Calculate weighted portfolio return
-            portfolio_return = 0.0
-            
-            # Long positions: profit when stocks go up
-            if n_long > 0:
-                long_stocks = day_data[day_data['signal'] == 1]
-                long_returns = long_stocks['daily_return'].dropna()
-                if len(long_returns) > 0:
-                    avg_long_return = long_returns.mean()
-                    portfolio_return += avg_long_return * (n_long / total_positions)
-            
-            # Short positions: profit when stocks go down
-            if n_short > 0:
-                short_stocks = day_data[day_data['signal'] == -1]
-                short_returns = short_stocks['daily_return'].dropna()
-                if len(short_returns) > 0:
-                    avg_short_return = -short_returns.mean()  # Negative because we're shorting
-                    portfolio_return += avg_short_return * (n_short / total_positions)
-            
-            # Apply transaction costs
-            net_return = portfolio_return - self.commission - self.slippage
-            
-            # Update equity
-            current_equity *= (1 + net_return)
-            
-            equity_curve.append({
-                'date': date,
-                'equity': current_equity,
-                'return': net_return
-            })
-            
-            # Progress
-            if (i + 1) % 50 == 0:
-                print(f"  Processed {i+1}/{len(dates)} days...")
-        
-        # Convert to DataFrame
-        equity_df = pd.DataFrame(equity_curve)
+        equity, net_return = run_backtest_kernel(
+            date_ids,
+            df['signal'].to_numpy(dtype=np.float64),
+            df['daily_return'].to_numpy(dtype=np.float64),
+            len(dates),
+            float(self.commission),
+            float(self.slippage),
+            float(self.initial_cash),
+        )
+        
+        equity_df = pd.DataFrame({
+            'date': dates,
+            'equity': equity,
+            'return': net_return
+        })
         
         # Calculate metrics
         metrics = self.calculate_metrics(equity_df)
@@ -124,29 +106,29 @@ class SimpleBacktester:
     def calculate_metrics(self, equity_df):
         """Calculate performance metrics"""
         
-        returns = equity_df['return'].dropna()
-        equity = equity_df['equity']
+        equity = equity_df['equity'].to_numpy(dtype=np.float64)
+        
+        # Mean/std/win count of the returns and max drawdown of the equity,
+        # computed in one compiled call
+        n_returns, mean_return, std_return, n_wins, max_drawdown = equity_metrics_kernel(
+            equity_df['return'].to_numpy(dtype=np.float64), equity
+        )
         
         # Total return
-        total_return = (equity.iloc[-1] / equity.iloc[0]) - 1
+        total_return = (equity[-1] / equity[0]) - 1
         
         # Annualized return
         n_years = len(equity) / 252
         annual_return = (1 + total_return) ** (1 / n_years) - 1 if n_years > 0 else 0
         
         # Sharpe ratio
-        if returns.std() > 0:
-            sharpe = (returns.mean() / returns.std()) * np.sqrt(252)
+        if std_return > 0:
+            sharpe = (mean_return / std_return) * np.sqrt(252)
         else:
             sharpe = 0
         
-        # Max drawdown
-        running_max = equity.expanding().max()
-        drawdown = (equity - running_max) / running_max
-        max_drawdown = drawdown.min()
-        
         # Win rate
-        win_rate = (returns > 0).sum() / len(returns) if len(returns) > 0 else 0
+        win_rate = n_wins / n_returns if n_returns > 0 else 0
         
         return {
             'total_return': total_return,
@@ -193,7 +175,8 @@ if __name__ == "__main__":
     
     # Save results
     print("\n5. Saving results...")
-    results['equity_curve'].to_csv('projects/b3_baselines/outputs/equity_curve.csv', index=False)
-    print("   ✓ Saved to outputs/equity_curve.csv")
+    results['equity_curve'].to_parquet('projects/b3_baselines/outputs/equity_curve.parquet',
+                                       compression='zstd', index=False)
+    print("   ✓ Saved to outputs/equity_curve.parquet")
     
     print("\n✓ TEST COMPLETE!")
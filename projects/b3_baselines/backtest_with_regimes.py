@@ -31,19 +31,38 @@ def simple_backtest(signals: pd.DataFrame, prices: pd.DataFrame, initial_capital
     logger.info("Running backtest...")
     
     # Merge signals with prices
-    merged = signals.merge(prices[['date', 'ticker', 'close']], on=['date', 'ticker'], how='inner')
+    merged = signals[['date', 'ticker', 'signal']].merge(
+        prices[['date', 'ticker', 'close']], on=['date', 'ticker'], how='inner'
+    )
     
-    # Calculate daily returns for each position
-    merged['returns'] = merged.groupby('ticker')['close'].pct_change()
+    # Calculate daily returns for each position: stable-sort rows by ticker code,
+    # shift once, and mask the first row of each ticker
+    merged['ticker'] = merged['ticker'].astype('category')
+    codes = merged['ticker'].cat.codes.to_numpy()
+    close = merged['close'].to_numpy(dtype=np.float64)
+    order = np.argsort(codes, kind='stable')
+    prev_in_order = np.full(len(merged), np.nan)
+    prev_in_order[1:] = close[order][:-1]
+    prev_in_order[1:][codes[order][1:] != codes[order][:-1]] = np.nan
+    prev_close = np.empty(len(merged))
+    prev_close[order] = prev_in_order
+    prev_close[codes < 0] = np.nan
+    merged['returns'] = close / prev_close - 1
     
     # Apply transaction costs
     total_cost = commission_pct + slippage_pct
     merged['net_returns'] = merged['returns'] * merged['signal'] - total_cost * abs(merged['signal'])
     
     # Calculate portfolio returns (equal-weighted among active positions)
-    daily_returns = merged.groupby('date').apply(
-        lambda x: x['net_returns'].mean() if (x['signal'] != 0).any() else 0
-    )
+    # (mean over the date's rows; 0 on dates without any position).
+    # Dates are factorized once and both aggregations share one grouper
+    date_codes, date_uniques = pd.factorize(merged['date'], sort=True)
+    daily = pd.DataFrame({
+        'net_returns': merged['net_returns'].to_numpy(),
+        'has_position': merged['signal'].to_numpy() != 0
+    }).groupby(date_codes).agg(net_returns=('net_returns', 'mean'), has_position=('has_position', 'any'))
+    daily.index = date_uniques[daily.index].rename('date')
+    daily_returns = daily['net_returns'].where(daily['has_position'], 0.0)
     
     # Calculate equity curve
     equity = initial_capital * (1 + daily_returns).cumprod()
@@ -75,6 +94,28 @@ def simple_backtest(signals: pd.DataFrame, prices: pd.DataFrame, initial_capital
     return results
 
 
+def run_one(features: pd.DataFrame, regimes: pd.DataFrame, prices: pd.DataFrame,
+            allowed_regimes=(0, 1, 2), top_pct=30, bottom_pct=30):
+    """
+    Generate regime-conditioned momentum signals and backtest them
+    
+    Args:
+        features: Feature data with momentum indicators
+        regimes: Regime labels from B4
+        prices: DataFrame with date, ticker, close columns
+        allowed_regimes: Regimes where the strategy may trade
+        top_pct: Top % to go long
+        bottom_pct: Bottom % to go short
+    
+    Returns:
+        Dictionary with performance metrics (see simple_backtest)
+    """
+    strategy = RegimeConditionedMomentum(allowed_regimes=list(allowed_regimes),
+                                         top_pct=top_pct, bottom_pct=bottom_pct)
+    signals = strategy.generate_signals(features, regimes)
+    return simple_backtest(signals, prices)
+
+
 def main():
     logger.info("=" * 70)
     logger.info("B3+B4 INTEGRATION - REGIME-CONDITIONED BACKTEST")
@@ -96,18 +137,14 @@ def main():
     logger.info("STRATEGY 1: Regular Momentum (No Regime Filter)")
     logger.info("=" * 70)
     
-    regular_strategy = RegimeConditionedMomentum(allowed_regimes=[0, 1, 2])  # All regimes
-    regular_signals = regular_strategy.generate_signals(features, regimes)
-    regular_results = simple_backtest(regular_signals, prices)
+    regular_results = run_one(features, regimes, prices, allowed_regimes=[0, 1, 2])  # All regimes
     
     # Strategy 2: Regime-Conditioned Momentum (only Regime 0 - Expansion)
     logger.info("\n" + "=" * 70)
     logger.info("STRATEGY 2: Regime-Conditioned Momentum (Regime 0 Only)")
     logger.info("=" * 70)
     
-    regime_strategy = RegimeConditionedMomentum(allowed_regimes=[0])  # Only expansion
-    regime_signals = regime_strategy.generate_signals(features, regimes)
-    regime_results = simple_backtest(regime_signals, prices)
+    regime_results = run_one(features, regimes, prices, allowed_regimes=[0])  # Only expansion
     
     # Comparison
     logger.info("\n" + "=" * 70)
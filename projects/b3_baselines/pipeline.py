@@ -58,8 +58,8 @@ def main():
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     
     # Save equity curve
-    equity_file = f'{output_dir}/equity_curve_{timestamp}.csv'
-    results['equity_curve'].to_csv(equity_file, index=False)
+    equity_file = f'{output_dir}/equity_curve_{timestamp}.parquet'
+    results['equity_curve'].to_parquet(equity_file, compression='zstd', index=False)
     print(f"✓ Equity curve saved: {equity_file}")
     
     # Save metrics
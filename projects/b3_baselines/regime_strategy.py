@@ -40,59 +40,61 @@ class RegimeConditionedMomentum:
         """
         logger.info(f"Generating regime-conditioned signals for {len(features)} observations...")
         
-        # Merge features with regime labels
-        merged = features.copy()
-        merged['date'] = pd.to_datetime(merged['date'])
+        if 'momentum_60d' in features.columns:
+            momentum_col = 'momentum_60d'
+        elif 'returns_60d' in features.columns:
+            momentum_col = 'returns_60d'
+        else:
+            momentum_col = None
+            logger.warning("No momentum column found; all signals stay in cash")
         
-        # Convert regime date to datetime
-        regime_labels['date'] = pd.to_datetime(regime_labels['date'])
+        # Merge features with regime labels (only the columns the signal needs,
+        # instead of copying the whole feature matrix)
+        merged = features[['date', 'ticker'] + ([momentum_col] if momentum_col else [])]
         
-        # Merge on date (broadcast monthly regimes to daily data)
-        merged['year_month'] = merged['date'].dt.to_period('M')
-        regime_labels['year_month'] = pd.to_datetime(regime_labels['date']).dt.to_period('M')
+        # Dates are parsed once at the loaders (features parquet,
+        # load_latest_regime_labels), not on every call
+        assert pd.api.types.is_datetime64_dtype(merged['date']), "features['date'] must be datetime64"
+        assert pd.api.types.is_datetime64_dtype(regime_labels['date']), "regime_labels['date'] must be datetime64"
         
-        merged = merged.merge(
-            regime_labels[['year_month', 'regime']], 
-            on='year_month', 
-            how='left'
+        # Match the label date resolution to the features for the asof join
+        labels = regime_labels[['date', 'regime']].assign(
+            date=regime_labels['date'].astype(merged['date'].dtype)
+        ).sort_values('date')
+        
+        # Each day takes the latest regime label on or before it (B4 labels are
+        # month-start dated, so this broadcasts monthly regimes to daily data)
+        merged = pd.merge_asof(
+            merged.sort_values('date', kind='stable'),
+            labels,
+            on='date',
+            direction='backward'
         )
         
-        # Forward-fill regime for any missing dates
-        merged['regime'] = merged['regime'].fillna(method='ffill')
+        # Regimes are small integers: nullable int8 (days before the first label stay <NA>)
+        merged['regime'] = merged['regime'].astype('Int8')
         
-        # Calculate momentum signals (using 60-day momentum)
-        merged['signal'] = 0.0
+        # Calculate momentum signals (using 60-day momentum), built as one array
+        # and assigned once
+        signal = np.zeros(len(merged), dtype=np.float64)
         
-        for date in merged['date'].unique():
-            date_data = merged[merged['date'] == date].copy()
-            current_regime = date_data['regime'].iloc[0] if len(date_data) > 0 else None
+        if momentum_col is not None:
+            # Position of each row in its date's momentum ranking (1 = strongest,
+            # missing momentum last), so every date is ranked in one grouped pass
+            by_date = merged.groupby('date', sort=False)
+            position = by_date[momentum_col].rank(method='first', ascending=False, na_option='bottom').to_numpy()
+            n_rows = by_date[momentum_col].transform('size').to_numpy()
+            n_long = (n_rows * self.top_pct / 100).astype(int)
+            n_short = (n_rows * self.bottom_pct / 100).astype(int)
+            
+            # Only generate signals in allowed regimes; otherwise stay in cash (signal = 0)
+            allowed = merged['regime'].isin(self.allowed_regimes).to_numpy()
             
-            # Only generate signals in allowed regimes
-            if current_regime in self.allowed_regimes:
-                # Sort by momentum
-                if 'momentum_60d' in date_data.columns:
-                    momentum_col = 'momentum_60d'
-                elif 'returns_60d' in date_data.columns:
-                    momentum_col = 'returns_60d'
-                else:
-                    logger.warning(f"No momentum column found for date {date}")
-                    continue
-                
-                date_data = date_data.sort_values(momentum_col, ascending=False)
-                
-                n_long = int(len(date_data) * self.top_pct / 100)
-                n_short = int(len(date_data) * self.bottom_pct / 100)
-                
-                # Long top performers
-                top_tickers = date_data.head(n_long)['ticker'].values
-                merged.loc[(merged['date'] == date) & (merged['ticker'].isin(top_tickers)), 'signal'] = 1.0
-                
-                # Short bottom performers
-                bottom_tickers = date_data.tail(n_short)['ticker'].values
-                merged.loc[(merged['date'] == date) & (merged['ticker'].isin(bottom_tickers)), 'signal'] = -1.0
-            else:
-                # In unfavorable regimes, go to cash (signal = 0)
-                merged.loc[merged['date'] == date, 'signal'] = 0.0
+            # Long top performers, short bottom performers
+            signal[allowed & (position <= n_long)] = 1.0
+            signal[allowed & (position > n_rows - n_short)] = -1.0
+        
+        merged['signal'] = signal
         
         logger.info(f"✓ Generated signals with regime conditioning")
         logger.info(f"  Long signals: {(merged['signal'] == 1.0).sum()}")
@@ -106,7 +108,7 @@ def load_latest_regime_labels() -> pd.DataFrame:
     """Load the most recent regime labels from B4"""
     import glob
     
-    regime_files = glob.glob('data/regimes/regime_labels_*.csv')
+    regime_files = glob.glob('data/regimes/regime_labels_*.parquet')
     if not regime_files:
         raise FileNotFoundError("No regime label files found. Run B4 first!")
     
@@ -114,7 +116,8 @@ def load_latest_regime_labels() -> pd.DataFrame:
     latest_file = max(regime_files)
     logger.info(f"Loading regime labels from: {latest_file}")
     
-    regime_df = pd.read_csv(latest_file)
+    regime_df = pd.read_parquet(latest_file)
+    regime_df['date'] = pd.to_datetime(regime_df['date'])
     logger.info(f"Loaded {len(regime_df)} regime labels")
     
     return regime_df
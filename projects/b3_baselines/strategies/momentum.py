@@ -6,6 +6,11 @@ Buy stocks going UP, short stocks going DOWN
 import pandas as pd
 import numpy as np
 
+try:
+    import polars as pl
+except ImportError:  # pragma: no cover - polars is optional
+    pl = None
+
 class MomentumStrategy:
     """Buy winners, sell losers"""
     
@@ -23,17 +28,26 @@ class MomentumStrategy:
         Returns:
             DataFrame with 'signal' column (1=buy, -1=sell, 0=hold)
         """
-        df = data.copy()
-        
         # Use the momentum_60d feature from B2
-        if 'momentum_60d' not in df.columns:
+        if 'momentum_60d' not in data.columns:
             raise ValueError("Need 'momentum_60d' feature from B2!")
         
+        # Project the needed columns; no full copy of the feature matrix
+        df = data[['date', 'ticker', 'close', 'momentum_60d']]
+        
         # Remove rows with missing momentum
         df = df.dropna(subset=['momentum_60d'])
         
         # For each date, rank stocks by momentum
-        df['momentum_rank'] = df.groupby('date')['momentum_60d'].rank(pct=True)
+        # (average rank / count, same as pandas rank(pct=True); polars ranks
+        # all dates on multiple threads)
+        if pl is not None:
+            ranks = pl.from_pandas(df[['date', 'momentum_60d']]).select(
+                (pl.col('momentum_60d').rank('average') / pl.col('momentum_60d').count()).over('date')
+            )
+            df['momentum_rank'] = ranks.to_series().to_numpy()
+        else:
+            df['momentum_rank'] = df.groupby('date', sort=False)['momentum_60d'].rank(pct=True)
         
         # Create signals
         df['signal'] = 0  # Default: hold
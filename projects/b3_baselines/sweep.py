@@ -0,0 +1,78 @@
+"""
+B3 Parameter Sweep - Regime-conditioned momentum over a grid of settings
+Each (top_pct, bottom_pct, allowed_regimes) point is an independent backtest,
+so the grid runs in parallel across cores.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import logging
+import pandas as pd
+from datetime import datetime
+from joblib import Parallel, delayed
+
+from core.config import load_yaml_cached
+from backtest_with_regimes import run_one
+from regime_strategy import load_latest_regime_labels
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Per-process inputs, loaded by the first grid point a worker runs
+_worker = {}
+
+
+def default_grid():
+    """Long/short percentages × regime filters"""
+    return [
+        {'top_pct': top_pct, 'bottom_pct': bottom_pct, 'allowed_regimes': allowed_regimes}
+        for top_pct, bottom_pct in [(10, 10), (20, 20), (30, 30)]
+        for allowed_regimes in [(0,), (0, 1), (0, 1, 2)]
+    ]
+
+
+def _load_inputs(features_file: str):
+    """Features (memory-mapped), regimes and prices, read once per worker process"""
+    if _worker.get('features_file') != features_file:
+        features = pd.read_parquet(features_file, memory_map=True)
+        _worker.update(
+            features_file=features_file,
+            features=features,
+            regimes=load_latest_regime_labels(),
+            prices=features[['date', 'ticker', 'close']],
+        )
+    return _worker['features'], _worker['regimes'], _worker['prices']
+
+
+def _run_point(features_file: str, params: dict) -> dict:
+    """Worker: backtest one grid point on this process's cached inputs"""
+    features, regimes, prices = _load_inputs(features_file)
+    
+    results = run_one(features, regimes, prices, **params)
+    results.pop('equity_curve')
+    return {**params, **results}
+
+
+def run_sweep(features_file: str, grid=None, n_jobs: int = -1) -> pd.DataFrame:
+    """Backtest every grid point in a loky process pool"""
+    grid = default_grid() if grid is None else grid
+    logger.info(f"Sweeping {len(grid)} parameter sets...")
+    
+    rows = Parallel(n_jobs=n_jobs, backend='loky')(
+        delayed(_run_point)(features_file, params) for params in grid
+    )
+    return pd.DataFrame(rows).sort_values('sharpe_ratio', ascending=False).reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    config = load_yaml_cached('projects/b3_baselines/config.yaml')
+    
+    sweep = run_sweep(config['data']['features_file'])
+    print("\n" + sweep.to_string())
+    
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = f"projects/b3_baselines/outputs/sweep_{timestamp}.csv"
+    sweep.to_csv(output_file, index=False)
+    logger.info(f"\n✓ Sweep results saved to: {output_file}")
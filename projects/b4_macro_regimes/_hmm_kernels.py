@@ -0,0 +1,81 @@
+"""Numba-compiled inner loops for the B4 regime model."""
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, cache=True)
+def diag_gaussian_loglik_kernel(X, means, covars, out):
+    """
+    Log-density of every observation under every diagonal-covariance state.
+    
+    Fills out[T, K]; 1/var and the log-normalizer are computed once per state
+    outside the loop over observations.
+    """
+    n_states, n_features = means.shape
+    inv_var = 1.0 / covars
+    log_norm = np.empty(n_states)
+    for k in range(n_states):
+        s = n_features * np.log(2.0 * np.pi)
+        for d in range(n_features):
+            s += np.log(covars[k, d])
+        log_norm[k] = -0.5 * s
+    
+    for t in prange(X.shape[0]):
+        for k in range(n_states):
+            sq = 0.0
+            for d in range(n_features):
+                diff = X[t, d] - means[k, d]
+                sq += diff * diff * inv_var[k, d]
+            out[t, k] = log_norm[k] - 0.5 * sq
+
+
+@njit(cache=True)
+def _logsumexp(a):
+    """Stable log(sum(exp(a))) of a 1-D array; -inf when every entry is -inf."""
+    m = a.max()
+    if np.isinf(m):
+        return m
+    s = 0.0
+    for i in range(a.shape[0]):
+        s += np.exp(a[i] - m)
+    return m + np.log(s)
+
+
+@njit(cache=True)
+def forward_backward_kernel(logprob, log_startprob, log_transmat):
+    """
+    State posteriors from log-space forward/backward passes.
+    
+    Each step reuses one K-vector of scratch instead of building a K x K
+    intermediate; rows of the result sum to 1.
+    """
+    n_samples, n_states = logprob.shape
+    alpha = np.empty((n_samples, n_states))
+    beta = np.empty((n_samples, n_states))
+    work = np.empty(n_states)
+    
+    for j in range(n_states):
+        alpha[0, j] = log_startprob[j] + logprob[0, j]
+    for t in range(1, n_samples):
+        for j in range(n_states):
+            for i in range(n_states):
+                work[i] = alpha[t - 1, i] + log_transmat[i, j]
+            alpha[t, j] = _logsumexp(work) + logprob[t, j]
+    
+    beta[n_samples - 1, :] = 0.0
+    for t in range(n_samples - 2, -1, -1):
+        for i in range(n_states):
+            for j in range(n_states):
+                work[j] = log_transmat[i, j] + logprob[t + 1, j] + beta[t + 1, j]
+            beta[t, i] = _logsumexp(work)
+    
+    posteriors = np.empty((n_samples, n_states))
+    for t in range(n_samples):
+        for k in range(n_states):
+            work[k] = alpha[t, k] + beta[t, k]
+        norm = _logsumexp(work)
+        for k in range(n_states):
+            posteriors[t, k] = np.exp(work[k] - norm)
+    return posteriors
+
@@ -4,40 +4,85 @@ Downloads FRED macro data
 """
 
 import os
+import time
 import logging
+from pathlib import Path
 from typing import List
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd
 import numpy as np
 from fredapi import Fred
 
 logger = logging.getLogger(__name__)
 
+FRED_CACHE_DIR = Path('data/cache/fred')
+FRED_CACHE_TTL_SECONDS = 24 * 3600
+
 
 class FREDDataLoader:
     """Load FRED macroeconomic data"""
     
-    def __init__(self, api_key: str, series_ids: List[str]):
+    def __init__(self, api_key: str, series_ids: List[str], cache_dir=FRED_CACHE_DIR):
         self.fred = Fred(api_key=api_key)
         self.series_ids = series_ids
+        # Parquet cache of raw series; None disables it
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
         logger.info(f"FRED Data Loader initialized with {len(series_ids)} series")
     
-    def download_all(self, start_date: str, end_date: str) -> pd.DataFrame:
-        """Download all FRED series"""
+    def download_all(self, start_date: str, end_date: str, max_workers: int = 8) -> pd.DataFrame:
+        """
+        Download all FRED series (concurrently; one HTTP round-trip each).
+        
+        Series fetched within the last day are read from the parquet cache;
+        set QUANTFORGE_REFRESH=1 to refetch.
+        """
         logger.info(f"Downloading {len(self.series_ids)} FRED series...")
         
-        data = {}
+        results = {}
+        to_fetch = []
         for series_id in self.series_ids:
-            try:
-                series = self.fred.get_series(series_id, observation_start=start_date, observation_end=end_date)
-                data[series_id] = series
-                logger.info(f"✓ Downloaded {series_id}: {len(series)} observations")
-            except Exception as e:
-                logger.error(f"✗ Failed to download {series_id}: {e}")
+            cache_path = self._cache_path(series_id, start_date, end_date)
+            if (cache_path is not None and cache_path.exists()
+                    and os.getenv('QUANTFORGE_REFRESH') != '1'
+                    and cache_path.stat().st_mtime > time.time() - FRED_CACHE_TTL_SECONDS):
+                results[series_id] = pd.read_parquet(cache_path)['value']
+                logger.info(f"✓ Cached {series_id}: {len(results[series_id])} observations")
+            else:
+                to_fetch.append(series_id)
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(to_fetch)))) as executor:
+            futures = {
+                executor.submit(self.fred.get_series, series_id,
+                                observation_start=start_date, observation_end=end_date): series_id
+                for series_id in to_fetch
+            }
+            for future in as_completed(futures):
+                series_id = futures[future]
+                try:
+                    results[series_id] = future.result()
+                    logger.info(f"✓ Downloaded {series_id}: {len(results[series_id])} observations")
+                except Exception as e:
+                    logger.error(f"✗ Failed to download {series_id}: {e}")
+                    continue
+                
+                cache_path = self._cache_path(series_id, start_date, end_date)
+                if cache_path is not None:
+                    cache_path.parent.mkdir(parents=True, exist_ok=True)
+                    results[series_id].to_frame('value').to_parquet(cache_path, compression='zstd')
+        
+        # Keep the configured series order for the columns
+        data = {series_id: results[series_id] for series_id in self.series_ids if series_id in results}
         
         df = pd.DataFrame(data)
         logger.info(f"Downloaded macro data: {df.shape[0]} dates × {df.shape[1]} indicators")
         return df
     
+    def _cache_path(self, series_id: str, start_date: str, end_date: str):
+        """Cache file for one (series, start, end) request, or None if caching is off"""
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{series_id}_{start_date}_{end_date}.parquet"
+    
     def engineer_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Create features from raw FRED data"""
         logger.info("Engineering features...")
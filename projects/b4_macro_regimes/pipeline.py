@@ -74,9 +74,12 @@ def main():
     logger.info("\nStep 6: Saving results...")
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
-    # Save regime labels
-    output_file = f"data/regimes/regime_labels_{timestamp}.csv"
-    predictions.to_csv(output_file, index=False)
+    # Save regime labels (parquet keeps dtypes; regimes are already int8 and
+    # probabilities need no more than float32)
+    prob_cols = [c for c in predictions.columns if c.startswith('prob_regime_')]
+    predictions[prob_cols] = predictions[prob_cols].astype('float32')
+    output_file = f"data/regimes/regime_labels_{timestamp}.parquet"
+    predictions.to_parquet(output_file, index=False, compression='zstd')
     logger.info(f"✓ Saved regime labels: {output_file}")
     
     # Print summary
@@ -0,0 +1,92 @@
+"""Numba-compiled inner loops for B5 text scoring."""
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - numba is optional
+    HAVE_NUMBA = False
+    
+    def njit(*args, **kwargs):
+        """Fallback no-op decorator when numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+def build_keyword_automaton(words):
+    """
+    Aho-Corasick automaton over ASCII keywords as a dense DFA.
+    
+    Returns (goto[state, byte], word_at[state], dict_link[state], word_len):
+    goto folds A-Z onto a-z, word_at is the keyword ending at a state (-1 if
+    none) and dict_link points to the next shorter state that ends a keyword.
+    """
+    children = [{}]
+    word_at = [-1]
+    for w, word in enumerate(words):
+        state = 0
+        for byte in word.lower().encode('ascii'):
+            if byte not in children[state]:
+                children.append({})
+                word_at.append(-1)
+                children[state][byte] = len(children) - 1
+            state = children[state][byte]
+        word_at[state] = w
+    
+    n_states = len(children)
+    goto = np.zeros((n_states, 256), dtype=np.int32)
+    fail = np.zeros(n_states, dtype=np.int32)
+    dict_link = np.full(n_states, -1, dtype=np.int32)
+    
+    # Breadth-first: a state's fail target is always resolved before it
+    queue = []
+    for byte, child in children[0].items():
+        goto[0, byte] = child
+        queue.append(child)
+    head = 0
+    while head < len(queue):
+        state = queue[head]
+        head += 1
+        goto[state] = goto[fail[state]]
+        for byte, child in children[state].items():
+            fail[child] = goto[fail[state], byte]
+            goto[state, byte] = child
+            target = fail[child]
+            dict_link[child] = target if word_at[target] >= 0 else dict_link[target]
+            queue.append(child)
+    
+    # Case-insensitive: upper-case letters follow the lower-case transitions
+    upper = np.arange(ord('A'), ord('Z') + 1)
+    goto[:, upper] = goto[:, upper + 32]
+    
+    word_len = np.array([len(word) for word in words], dtype=np.int64)
+    return goto, np.array(word_at, dtype=np.int32), dict_link, word_len
+
+
+@njit(cache=True)
+def _is_word_byte(b):
+    """ASCII [A-Za-z0-9_]; non-ASCII bytes count as boundaries"""
+    return (b >= 97 and b <= 122) or (b >= 65 and b <= 90) or (b >= 48 and b <= 57) or b == 95
+
+
+@njit(nogil=True, cache=True)
+def count_keywords_kernel(buf, goto, word_at, dict_link, word_len, counts):
+    """
+    Whole-word keyword counts in one pass over UTF-8 bytes.
+    
+    One table lookup per byte; a hit counts only when the bytes on both sides
+    are not word characters (as regex \\b for the ASCII keywords).
+    """
+    n = buf.shape[0]
+    state = 0
+    for i in range(n):
+        state = goto[state, buf[i]]
+        s = state if word_at[state] >= 0 else dict_link[state]
+        while s >= 0:
+            w = word_at[s]
+            start = i - word_len[w] + 1
+            if (start == 0 or not _is_word_byte(buf[start - 1])) and (i + 1 == n or not _is_word_byte(buf[i + 1])):
+                counts[w] += 1
+            s = dict_link[s]
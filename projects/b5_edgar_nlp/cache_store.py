@@ -0,0 +1,89 @@
+"""On-disk cache of parsed and scored 10-K filings, keyed by accession number"""
+
+import sqlite3
+from pathlib import Path
+
+
+# Bump whenever RiskScorer or SentimentAnalyzer output changes: cached
+# results from an older version are dropped (parsed text is kept)
+SCORER_VERSION = 1
+
+RESULT_COLUMNS = [
+    'ticker', 'filing_date', 'sentiment', 'positive_ratio', 'negative_ratio',
+    'neutral_ratio', 'risk_score', 'text_length'
+]
+
+
+class CacheStore:
+    """
+    SQLite store of per-filing results and extracted Risk Factors text
+    
+    Rows are committed as they are written, so an interrupted run resumes
+    where it stopped and later runs only process newly filed 10-Ks.
+    """
+    
+    def __init__(self, db_path="../../data/edgar/cache.sqlite"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=30)
+        # WAL lets pipeline workers read/write text while the main process writes results
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS filings (
+                accession TEXT PRIMARY KEY,
+                ticker TEXT,
+                filing_date TEXT,
+                sentiment TEXT,
+                positive_ratio REAL,
+                negative_ratio REAL,
+                neutral_ratio REAL,
+                risk_score REAL,
+                text_length INTEGER
+            )
+        """)
+        # Parsed text is kept separately so a new sentiment/scoring model
+        # can rerun without re-parsing the HTML
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS risk_text (
+                accession TEXT PRIMARY KEY,
+                text TEXT
+            )
+        """)
+        self._check_scorer_version()
+        self.conn.commit()
+    
+    def _check_scorer_version(self):
+        """Clear scored results written by a different SCORER_VERSION"""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCORER_VERSION:
+            self.conn.execute("DELETE FROM filings")
+            self.conn.execute(f"PRAGMA user_version = {SCORER_VERSION}")
+    
+    def get_result(self, accession):
+        """Cached result dict for a filing, or None"""
+        row = self.conn.execute(
+            f"SELECT {', '.join(RESULT_COLUMNS)} FROM filings WHERE accession = ?", (accession,)
+        ).fetchone()
+        return dict(zip(RESULT_COLUMNS, row)) if row else None
+    
+    def put_result(self, accession, result):
+        """Store (or replace) a filing's result dict"""
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO filings (accession, {', '.join(RESULT_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * (len(RESULT_COLUMNS) + 1))})",
+            (accession, *(result[col] for col in RESULT_COLUMNS))
+        )
+        self.conn.commit()
+    
+    def get_text(self, accession):
+        """Cached Risk Factors text for a filing, or None"""
+        row = self.conn.execute("SELECT text FROM risk_text WHERE accession = ?", (accession,)).fetchone()
+        return row[0] if row else None
+    
+    def put_text(self, accession, text):
+        """Store (or replace) a filing's Risk Factors text"""
+        self.conn.execute("INSERT OR REPLACE INTO risk_text (accession, text) VALUES (?, ?)", (accession, text))
+        self.conn.commit()
+    
+    def close(self):
+        self.conn.close()
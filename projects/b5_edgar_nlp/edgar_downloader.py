@@ -1,8 +1,10 @@
 """Download SEC 10-K filings"""
 
 import os
-import time
 import logging
+import sqlite3
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from sec_edgar_downloader import Downloader
 
@@ -17,6 +19,21 @@ class EDGARDownloader:
         self.downloader = Downloader(company_name, email)
         self.cache_dir = Path("../../data/edgar/raw")
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Manifest of downloaded filings per ticker, so unchanged filing
+        # directories are answered without walking them again
+        self.manifest_path = self.cache_dir / "manifest.sqlite"
+        with closing(sqlite3.connect(self.manifest_path, timeout=30)) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS manifest (
+                    ticker TEXT,
+                    accession TEXT,
+                    path TEXT,
+                    mtime REAL,
+                    PRIMARY KEY (ticker, accession)
+                )
+            """)
+            conn.commit()
         print(f"✅ EDGAR Downloader ready")
         print(f"   Cache: {self.cache_dir.absolute()}")
     
@@ -50,40 +67,71 @@ class EDGARDownloader:
                 return []
             
             # Get all primary-document.html files
-            files = list(filing_dir.glob("*/primary-document.html"))
+            files = self._list_filings(ticker, filing_dir)
             
             print(f"✅ {ticker}: Downloaded {len(files)} filings")
             
-            # Wait to respect SEC rate limit (10 requests/second max)
-            time.sleep(0.15)
-            
+            # SEC rate limit (10 requests/second max) is enforced by
+            # sec_edgar_downloader's process-wide limiter on every request
             return files
             
         except Exception as e:
             print(f"❌ {ticker}: Failed - {e}")
             return []
     
-    def download_batch(self, tickers, num_filings=3):
+    def _list_filings(self, ticker, filing_dir):
+        """
+        Primary documents under a ticker's filing directory
+        
+        New accessions change the directory's mtime, so while it matches the
+        manifest the stored paths are returned; otherwise the directory is
+        scanned once and the manifest rows for the ticker are replaced.
+        (Each call opens its own connection: downloads run on a thread pool.)
         """
-        Download 10-Ks for multiple tickers
+        dir_mtime = filing_dir.stat().st_mtime
+        
+        with closing(sqlite3.connect(self.manifest_path, timeout=30)) as conn:
+            rows = conn.execute(
+                "SELECT path, mtime FROM manifest WHERE ticker = ? ORDER BY accession DESC", (ticker,)
+            ).fetchall()
+            if rows and all(mtime == dir_mtime for _, mtime in rows):
+                return [Path(path) for path, _ in rows]
+            
+            files = sorted(filing_dir.glob("*/primary-document.html"), reverse=True)
+            conn.execute("DELETE FROM manifest WHERE ticker = ?", (ticker,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO manifest (ticker, accession, path, mtime) VALUES (?, ?, ?, ?)",
+                [(ticker, f.parent.name, str(f), dir_mtime) for f in files]
+            )
+            conn.commit()
+        
+        return files
+    
+    def download_batch(self, tickers, num_filings=3, max_workers=10):
+        """
+        Download 10-Ks for multiple tickers (concurrently)
+        
+        Downloads are bound by HTTP round-trips, so tickers are fetched from a
+        thread pool; the shared SEC limiter keeps the total under 10 req/s.
         
         Args:
             tickers: List of ticker symbols
             num_filings: Number of filings per ticker
+            max_workers: Maximum concurrent ticker downloads
         
         Returns:
-            Dictionary mapping ticker -> list of file paths
+            Dictionary mapping ticker -> list of file paths (in input order)
         """
-        results = {}
-        
         print(f"\n{'='*60}")
         print(f"Downloading 10-Ks for {len(tickers)} tickers")
         print(f"{'='*60}")
         
-        for i, ticker in enumerate(tickers, 1):
-            print(f"\n[{i}/{len(tickers)}] {ticker}")
-            files = self.download_10k(ticker, num_filings)
-            results[ticker] = files
+        if not tickers:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers)))) as executor:
+            file_lists = executor.map(lambda ticker: self.download_10k(ticker, num_filings), tickers)
+            results = dict(zip(tickers, file_lists))
         
         total_files = sum(len(files) for files in results.values())
         print(f"\n✅ Total: Downloaded {total_files} filings for {len(tickers)} tickers")
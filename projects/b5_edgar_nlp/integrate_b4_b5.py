@@ -3,7 +3,9 @@ Integrate B4 Macro Regimes + B5 EDGAR Risk Signals
 Creates enhanced trading signals for QuantForge strategy
 """
 
+import numpy as np
 import pandas as pd
+import pyarrow.parquet as pq
 from pathlib import Path
 from datetime import datetime
 
@@ -17,14 +19,17 @@ print("="*70 + "\n")
 
 print("📥 Loading B4 Regime Labels...")
 
-regime_files = list(Path("../../data/regimes").glob("regime_labels_*.csv"))
+regime_files = list(Path("../../data/regimes").glob("regime_labels_*.parquet"))
 if not regime_files:
     print("❌ No regime labels found!")
-    print("   Expected: ../../data/regimes/regime_labels_*.csv")
+    print("   Expected: ../../data/regimes/regime_labels_*.parquet")
     exit(1)
 
-latest_regime_file = sorted(regime_files)[-1]
-regimes = pd.read_csv(latest_regime_file)
+# Most recently written labels; only the columns used below are read
+# (the per-regime probability columns are skipped)
+latest_regime_file = max(regime_files, key=lambda p: p.stat().st_mtime)
+regime_columns = [c for c in ('date', 'ticker', 'regime') if c in pq.read_schema(latest_regime_file).names]
+regimes = pd.read_parquet(latest_regime_file, columns=regime_columns)
 
 print(f"✅ Loaded: {latest_regime_file.name}")
 print(f"   Shape: {regimes.shape}")
@@ -36,12 +41,16 @@ print(f"   Columns: {regimes.columns.tolist()}")
 
 print("\n📥 Loading B5 Risk Signals...")
 
-risk_file = Path("../../data/edgar/risk_signals_ALL_20260212.csv")
+risk_file = Path("../../data/edgar/risk_signals_ALL_20260212.parquet")
 if not risk_file.exists():
     print("❌ Risk signals not found!")
     exit(1)
 
-risk_signals = pd.read_csv(risk_file)
+# Only the columns the per-ticker aggregation uses
+risk_signals = pd.read_parquet(risk_file, columns=['ticker', 'risk_score', 'sentiment', 'negative_ratio'])
+# Repeated labels: group on integer category codes instead of hashing strings
+risk_signals['ticker'] = risk_signals['ticker'].astype('category')
+risk_signals['sentiment'] = risk_signals['sentiment'].astype('category')
 
 print(f"✅ Loaded: {risk_file.name}")
 print(f"   Shape: {risk_signals.shape}")
@@ -53,12 +62,16 @@ print(f"   Companies: {risk_signals['ticker'].nunique()}")
 
 print("\n🔧 Preparing data for integration...")
 
-# Get latest risk score per ticker
-latest_risk = risk_signals.groupby('ticker').agg({
-    'risk_score': 'mean',  # Average risk across filings
-    'sentiment': lambda x: x.mode()[0] if len(x) > 0 else 'neutral',
-    'negative_ratio': 'mean'
-}).reset_index()
+# Get latest risk score per ticker (average risk across filings)
+numeric = risk_signals.groupby('ticker', observed=True)[['risk_score', 'negative_ratio']].mean()
+
+# Most common sentiment per ticker (ties go to the alphabetically first label)
+sentiment_mode = risk_signals.groupby(['ticker', 'sentiment'], observed=True).size().unstack(fill_value=0).idxmax(axis=1)
+
+# (one row per ticker: labels go back to plain strings for the saved signals)
+latest_risk = numeric.join(sentiment_mode.rename('sentiment'))[
+    ['risk_score', 'sentiment', 'negative_ratio']
+].reset_index().astype({'ticker': str, 'sentiment': str})
 
 print(f"✅ Prepared {len(latest_risk)} tickers with risk scores")
 
@@ -88,6 +101,12 @@ else:
     latest_risk['regime'] = current_regime
     combined = latest_risk
 
+# Regime is resolved once here (missing -> expansion) so the signal rules
+# below work on a plain int8 array
+if 'regime' not in combined.columns:
+    combined['regime'] = 0
+combined['regime'] = combined['regime'].astype('int8')
+
 print(f"✅ Combined dataset shape: {combined.shape}")
 
 # ============================================================================
@@ -96,45 +115,29 @@ print(f"✅ Combined dataset shape: {combined.shape}")
 
 print("\n📊 Generating trading signals...\n")
 
-# Define signal logic
-def generate_signal(row):
-    """
-    Generate trading signal based on regime + risk
-    
-    Regime 0 (Expansion): Long stocks, prefer low-risk
-    Regime 1 (Transition): Neutral, avoid high-risk
-    Regime 2 (Crisis): Defensive, only very low-risk
-    """
-    regime = row.get('regime', 0)
-    risk_score = row['risk_score']
-    
-    if regime == 0:  # Expansion
-        if risk_score < 0.3:
-            return 'STRONG_BUY'
-        elif risk_score < 0.5:
-            return 'BUY'
-        elif risk_score < 0.7:
-            return 'HOLD'
-        else:
-            return 'AVOID'
-    
-    elif regime == 1:  # Transition
-        if risk_score < 0.4:
-            return 'BUY'
-        elif risk_score < 0.6:
-            return 'HOLD'
-        else:
-            return 'SELL'
-    
-    else:  # regime == 2, Crisis
-        if risk_score < 0.3:
-            return 'HOLD'
-        elif risk_score < 0.5:
-            return 'REDUCE'
-        else:
-            return 'STRONG_SELL'
-
-combined['signal'] = combined.apply(generate_signal, axis=1)
+# Signal logic, evaluated for all tickers at once (first matching rule wins):
+#   Regime 0 (Expansion): Long stocks, prefer low-risk
+#   Regime 1 (Transition): Neutral, avoid high-risk
+#   Regime 2 (Crisis): Defensive, only very low-risk
+regime = combined['regime'].to_numpy()
+risk_score = combined['risk_score'].to_numpy()
+expansion = regime == 0
+transition = regime == 1
+
+conditions = [
+    expansion & (risk_score < 0.3),
+    expansion & (risk_score < 0.5),
+    expansion & (risk_score < 0.7),
+    expansion,
+    transition & (risk_score < 0.4),
+    transition & (risk_score < 0.6),
+    transition,
+    risk_score < 0.3,  # Crisis (any other regime) from here on
+    risk_score < 0.5,
+]
+choices = ['STRONG_BUY', 'BUY', 'HOLD', 'AVOID', 'BUY', 'HOLD', 'SELL', 'HOLD', 'REDUCE']
+
+combined['signal'] = np.select(conditions, choices, default='STRONG_SELL')
 
 # ============================================================================
 # STEP 6: Display Results
@@ -145,7 +148,7 @@ print("TRADING SIGNALS SUMMARY")
 print("="*70 + "\n")
 
 # Current regime
-current_regime = combined['regime'].iloc[0] if 'regime' in combined.columns else 0
+current_regime = int(combined['regime'].iloc[0])
 regime_names = {0: 'EXPANSION (Bullish)', 1: 'TRANSITION (Neutral)', 2: 'CRISIS (Bearish)'}
 print(f"📈 Current Market Regime: {current_regime} - {regime_names.get(current_regime, 'Unknown')}\n")
 
@@ -176,8 +179,8 @@ for signal in ['STRONG_BUY', 'BUY', 'STRONG_SELL', 'SELL']:
 # STEP 7: Save Combined Signals
 # ============================================================================
 
-output_file = Path("../../data/trading_signals_b4_b5_20260212.csv")
-combined.to_csv(output_file, index=False)
+output_file = Path("../../data/trading_signals_b4_b5_20260212.parquet")
+combined.to_parquet(output_file, index=False, compression='zstd')
 
 print("="*70)
 print(f"✅ Saved combined signals to: {output_file.name}")
@@ -1,28 +1,128 @@
 """B5 Main Pipeline - Combines all components"""
 
+import os
+import sys
+import logging
 import pandas as pd
+import torch
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from edgar_downloader import EDGARDownloader
 from text_parser import TextParser
 from sentiment_analyzer import SentimentAnalyzer
 from risk_scorer import RiskScorer
+from cache_store import CacheStore, RESULT_COLUMNS
+
+
+logger = logging.getLogger(__name__)
+
+
+class _BufferedStdoutHandler(logging.StreamHandler):
+    """
+    Writes records to stdout without flushing after each one
+    
+    Records go through the same sys.stdout object as print(), so ordering is
+    kept while the stream's own buffering batches writes when piped.
+    """
+    
+    def __init__(self):
+        super().__init__(sys.stdout)
+    
+    def flush(self):
+        pass
+
+
+def setup_logging(level=logging.INFO):
+    """Send per-filing progress logs to stdout (message text only)"""
+    handler = _BufferedStdoutHandler()
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=level, handlers=[handler])
+
+
+# Per-worker NLP components, built once by _init_worker
+_worker = {}
+
+
+def _init_worker(cache_path):
+    """Load parser, FinBERT and scorer once per worker process"""
+    # One intra-op thread per worker: the parallelism is across filings
+    torch.set_num_threads(1)
+    _worker['parser'] = TextParser()
+    _worker['sentiment'] = SentimentAnalyzer()
+    _worker['scorer'] = RiskScorer()
+    # Workers share the text cache through SQLite, so Risk Factors text
+    # (hundreds of KB per filing) is never pickled between processes
+    _worker['cache'] = CacheStore(cache_path)
+
+
+def _process_filing(job):
+    """
+    Parse, analyze and score one filing (runs in a worker process)
+    
+    Args:
+        job: (ticker, file_path, filing_date, accession)
+    
+    Returns:
+        Result dict, or None if no Risk Factors were found
+    """
+    ticker, file_path, filing_date, accession = job
+    
+    # Parse Risk Factors (or reuse previously extracted text)
+    risk_text = _worker['cache'].get_text(accession)
+    if risk_text is None:
+        parsed = _worker['parser'].parse_filing(file_path)
+        if not parsed['found']:
+            return None
+        risk_text = parsed['risk_factors']
+        _worker['cache'].put_text(accession, risk_text)
+    
+    # Analyze sentiment
+    sentiment_result = _worker['sentiment'].analyze(risk_text, max_sentences=15)
+    
+    # Calculate risk score
+    risk_score = _worker['scorer'].calculate_risk_score(risk_text)
+    
+    result = {
+        'ticker': ticker,
+        'filing_date': filing_date,
+        'sentiment': sentiment_result['sentiment'],
+        'positive_ratio': sentiment_result['positive_ratio'],
+        'negative_ratio': sentiment_result['negative_ratio'],
+        'neutral_ratio': sentiment_result['neutral_ratio'],
+        'risk_score': risk_score,
+        'text_length': len(risk_text)
+    }
+    return result
 
 
 class B5Pipeline:
     """Complete B5 EDGAR NLP pipeline"""
     
-    def __init__(self):
+    def __init__(self, max_workers=None):
+        """
+        Args:
+            max_workers: Worker processes for parsing/sentiment/scoring
+                (default: up to 4; each one holds its own FinBERT copy)
+        """
         print("\n" + "="*60)
         print("B5 EDGAR NLP PIPELINE - Initializing")
         print("="*60 + "\n")
         
         self.downloader = EDGARDownloader()
-        self.parser = TextParser()
-        self.sentiment = SentimentAnalyzer()
-        self.scorer = RiskScorer()
+        self.cache = CacheStore()
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        
+        # Workers are started on first use and reused across run() calls
+        self.executor = None
         
-        print("\n✅ All components loaded\n")
+        print(f"\n✅ All components loaded ({self.max_workers} NLP workers)\n")
+    
+    def close(self):
+        """Shut down the NLP worker processes"""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
     
     def run(self, tickers, num_filings=2):
         """
@@ -39,55 +139,51 @@ class B5Pipeline:
         print(f"Processing {len(tickers)} tickers")
         print("="*60 + "\n")
         
-        results = []
+        # Results are accumulated column-wise and turned into a frame once
+        results = {col: [] for col in RESULT_COLUMNS}
         
-        for i, ticker in enumerate(tickers, 1):
-            print(f"[{i}/{len(tickers)}] {ticker}")
-            print("-" * 40)
-            
-            # Step 1: Download filings
-            files = self.downloader.download_10k(ticker, num_filings)
-            
-            if not files:
-                print(f"   ⚠️  No filings downloaded\n")
-                continue
-            
-            # Step 2: Process each filing
-            for file_path in files:
-                filing_date = file_path.parent.name[:10]
-                
-                # Parse Risk Factors
-                parsed = self.parser.parse_filing(file_path)
+        # Step 1: Download filings for all tickers up front (concurrent I/O)
+        downloads = self.downloader.download_batch(tickers, num_filings)
+        print()
+        
+        # Step 2: Reuse cached results; queue the rest for the worker pool
+        jobs = []
+        for ticker in tickers:
+            for file_path in downloads[ticker]:
+                accession = file_path.parent.name
+                filing_date = accession[:10]
                 
-                if not parsed['found']:
-                    print(f"   ⚠️  {filing_date}: No Risk Factors found")
+                cached = self.cache.get_result(accession)
+                if cached is not None:
+                    for col in RESULT_COLUMNS:
+                        results[col].append(cached[col])
+                    logger.info("   💾 %s %s: Cached (risk score %s)", ticker, filing_date, cached['risk_score'])
                     continue
                 
-                risk_text = parsed['risk_factors']
-                print(f"   📄 {filing_date}: Extracted {len(risk_text):,} chars")
-                
-                # Analyze sentiment
-                sentiment_result = self.sentiment.analyze(risk_text, max_sentences=15)
-                
-                # Calculate risk score
-                risk_score = self.scorer.calculate_risk_score(risk_text)
+                jobs.append((ticker, file_path, filing_date, accession))
+        
+        # Step 3: Parse, analyze and score new filings in parallel
+        if jobs:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker,
+                    initargs=(self.cache.db_path,)
+                )
+            
+            for (ticker, _, filing_date, accession), result in zip(jobs, self.executor.map(_process_filing, jobs)):
+                if result is None:
+                    logger.info("   ⚠️  %s %s: No Risk Factors found", ticker, filing_date)
+                    continue
                 
-                # Store result
-                results.append({
-                    'ticker': ticker,
-                    'filing_date': filing_date,
-                    'sentiment': sentiment_result['sentiment'],
-                    'positive_ratio': sentiment_result['positive_ratio'],
-                    'negative_ratio': sentiment_result['negative_ratio'],
-                    'neutral_ratio': sentiment_result['neutral_ratio'],
-                    'risk_score': risk_score,
-                    'text_length': len(risk_text)
-                })
+                for col in RESULT_COLUMNS:
+                    results[col].append(result[col])
+                self.cache.put_result(accession, result)
                 
-                print(f"   📊 Sentiment: {sentiment_result['sentiment']}")
-                print(f"   📊 Risk Score: {risk_score}")
-            
-            print()  # Blank line between tickers
+                logger.info("   📊 %s %s: %d chars | Sentiment: %s | Risk Score: %s",
+                            ticker, filing_date, result['text_length'], result['sentiment'], result['risk_score'])
+        
+        print()
         
         # Convert to DataFrame
         df = pd.DataFrame(results)
@@ -97,8 +193,8 @@ class B5Pipeline:
             output_dir = Path("../../data/edgar")
             output_dir.mkdir(parents=True, exist_ok=True)
             
-            output_file = output_dir / f"risk_signals_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            df.to_csv(output_file, index=False)
+            output_file = output_dir / f"risk_signals_{datetime.now().strftime('%Y%m%d_%H%M%S')}.parquet"
+            df.to_parquet(output_file, index=False, compression='zstd')
             
             print("="*60)
             print(f"✅ Pipeline Complete!")
@@ -118,12 +214,14 @@ class B5Pipeline:
 
 # Run the pipeline
 if __name__ == "__main__":
+    setup_logging()
     pipeline = B5Pipeline()
     
     # Test on 3 tickers
     test_tickers = ['AAPL', 'MSFT', 'GOOGL']
     
     risk_signals = pipeline.run(test_tickers, num_filings=2)
+    pipeline.close()
     
     if len(risk_signals) > 0:
         print("\n" + "="*60)
@@ -2,9 +2,11 @@
 
 import pandas as pd
 from pathlib import Path
-from pipeline import B5Pipeline
+from pipeline import B5Pipeline, setup_logging
 import time
 
+setup_logging()
+
 # Load your tickers from B1 market data
 print("Loading tickers from B1 data...")
 
@@ -15,7 +17,7 @@ if not market_data_file.exists():
     exit(1)
 
 print(f"✅ Using: {market_data_file.name}")
-market_data = pd.read_parquet(market_data_file)
+market_data = pd.read_parquet(market_data_file, columns=['ticker'])
 all_tickers = sorted(market_data['ticker'].unique().tolist())
 
 print(f"\n📊 Found {len(all_tickers)} tickers")
@@ -37,7 +39,15 @@ pipeline = B5Pipeline()
 
 # Process in batches of 10 (easier to track progress)
 batch_size = 10
-all_results = []
+
+# Each batch is written to its own parquet file as it finishes instead of
+# being held in memory until the end (stale files from a previous run are
+# cleared; their filings come back from the pipeline's result cache)
+batch_dir = Path("../../data/edgar/cache")
+batch_dir.mkdir(parents=True, exist_ok=True)
+for stale in batch_dir.glob("batch_*.parquet"):
+    stale.unlink()
+n_batches_written = 0
 
 start_time = time.time()
 
@@ -54,7 +64,8 @@ for batch_num in range(0, len(all_tickers), batch_size):
         batch_results = pipeline.run(batch_tickers, num_filings=2)
         
         if len(batch_results) > 0:
-            all_results.append(batch_results)
+            batch_results.to_parquet(batch_dir / f"batch_{batch_num//batch_size:04d}.parquet", index=False)
+            n_batches_written += 1
         
         # Progress update
         elapsed = time.time() - start_time
@@ -75,12 +86,12 @@ for batch_num in range(0, len(all_tickers), batch_size):
         print("   Continuing with next batch...")
 
 # Combine all results
-if all_results:
-    final_df = pd.concat(all_results, ignore_index=True)
+if n_batches_written:
+    final_df = pd.read_parquet(batch_dir)
     
     # Save final results
-    output_file = Path("../../data/edgar/risk_signals_ALL_20260212.csv")
-    final_df.to_csv(output_file, index=False)
+    output_file = Path("../../data/edgar/risk_signals_ALL_20260212.parquet")
+    final_df.to_parquet(output_file, index=False, compression='zstd')
     
     print(f"\n{'='*60}")
     print(f"✅ COMPLETE!")
@@ -107,5 +118,7 @@ if all_results:
 else:
     print("\n❌ No results generated")
 
+pipeline.close()
+
 total_time = time.time() - start_time
 print(f"\n⏱️  Total time: {total_time/60:.1f} minutes")
@@ -1,5 +1,10 @@
 """Calculate risk score from text based on keywords"""
 
+import re
+import numpy as np
+
+from _risk_kernels import HAVE_NUMBA, build_keyword_automaton, count_keywords_kernel
+
 
 class RiskScorer:
     """Scores text based on financial risk keywords"""
@@ -18,6 +23,33 @@ class RiskScorer:
             'adverse': 0.8,
             'volatile': 0.7
         }
+        
+        # One case-insensitive alternation finds every keyword in a single
+        # scan; word boundaries keep e.g. "asterisk" from counting as "risk"
+        # (one named group per word, so a hit maps back to its keyword)
+        self._group_words = {f'w{i}': word for i, word in enumerate(self.risk_words)}
+        self._pattern = re.compile(
+            '|'.join(rf'(?P<{group}>\b{re.escape(word)}\b)' for group, word in self._group_words.items()),
+            re.IGNORECASE
+        )
+        
+        # With numba, the same whole-word counts come from a compiled
+        # table-driven automaton over the UTF-8 bytes (one lookup per byte)
+        self._words = list(self.risk_words)
+        self._automaton = build_keyword_automaton(self._words) if HAVE_NUMBA else None
+    
+    def _count_words(self, text):
+        """Whole-word occurrences of each risk word (any case)"""
+        if self._automaton is not None:
+            counts = np.zeros(len(self._words), dtype=np.int64)
+            buf = np.frombuffer(text.encode('utf-8', errors='replace'), dtype=np.uint8)
+            count_keywords_kernel(buf, *self._automaton, counts)
+            return dict(zip(self._words, counts.tolist()))
+        
+        word_counts = dict.fromkeys(self.risk_words, 0)
+        for match in self._pattern.finditer(text):
+            word_counts[self._group_words[match.lastgroup]] += 1
+        return word_counts
     
     def calculate_risk_score(self, text):
         """
@@ -32,16 +64,9 @@ class RiskScorer:
         if len(text) < 100:
             return 0.0
         
-        text_lower = text.lower()
-        
         # Count each risk word
-        total_score = 0.0
-        word_counts = {}
-        
-        for word, weight in self.risk_words.items():
-            count = text_lower.count(word)
-            word_counts[word] = count
-            total_score += count * weight
+        word_counts = self._count_words(text)
+        total_score = sum(count * self.risk_words[word] for word, count in word_counts.items())
         
         # Normalize by text length (per 1000 characters)
         risk_score = total_score / (len(text) / 1000)
@@ -53,13 +78,7 @@ class RiskScorer:
     
     def get_top_risk_words(self, text, top_n=5):
         """Get the most frequent risk words in text"""
-        text_lower = text.lower()
-        
-        word_counts = {}
-        for word in self.risk_words.keys():
-            count = text_lower.count(word)
-            if count > 0:
-                word_counts[word] = count
+        word_counts = {word: count for word, count in self._count_words(text).items() if count > 0}
         
         # Sort by count
         sorted_words = sorted(word_counts.items(), key=lambda x: x[1], reverse=True)
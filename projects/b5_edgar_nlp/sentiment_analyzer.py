@@ -3,25 +3,108 @@
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import torch
 import numpy as np
+import re
+from collections import OrderedDict
 
 
 class SentimentAnalyzer:
     """Uses FinBERT to detect financial sentiment"""
     
-    def __init__(self):
+    _WHITESPACE = re.compile(r'\s+')
+    _SENTENCE_END = re.compile(r'[.!?]+')
+    
+    def __init__(self, cache_size=8192):
         print("📥 Loading FinBERT model (takes 30-60 seconds)...")
         
         # Load FinBERT model and tokenizer
         model_name = "ProsusAI/finbert"
         self.tokenizer = AutoTokenizer.from_pretrained(model_name)
-        self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
+        # (torchscript=True: tuple outputs, so the model can be traced)
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_name, torchscript=True)
         
         # Use CPU
         self.device = "cpu"
         self.model.eval()
+        self.model = self._quantize_model(self.model)
+        self.model = self._trace_model(self.model)
+        
+        # Label id per normalized sentence: boilerplate risk-factor sentences
+        # recur across filings, so only unseen ones go through the model
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
         
         print("✅ FinBERT loaded successfully")
     
+    def _calibration_inputs(self):
+        """Padded two-sentence batch and a single shorter input, as positional args"""
+        calibration = self.tokenizer(
+            [
+                "Revenue grew strongly this year.",
+                "We may incur significant losses from pending litigation and adverse market conditions."
+            ],
+            return_tensors="pt",
+            padding=True
+        )
+        batch = (calibration['input_ids'], calibration['attention_mask'])
+        single = (calibration['input_ids'][:1, :8], calibration['attention_mask'][:1, :8])
+        return batch, single
+    
+    def _quantize_model(self, model):
+        """
+        Dynamic int8 quantization of the Linear layers (4x smaller weights,
+        int8 GEMM kernels on CPU)
+        
+        Kept only if the predicted labels on the calibration inputs are
+        unchanged; otherwise the float32 model is returned.
+        """
+        engines = torch.backends.quantized.supported_engines
+        if 'fbgemm' in engines:
+            torch.backends.quantized.engine = 'fbgemm'
+        elif 'qnnpack' in engines:  # ARM
+            torch.backends.quantized.engine = 'qnnpack'
+        else:
+            return model
+        
+        try:
+            quantized = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            with torch.inference_mode():
+                for args in self._calibration_inputs():
+                    if not torch.equal(quantized(*args)[0].argmax(-1), model(*args)[0].argmax(-1)):
+                        print("⚠️  int8 FinBERT changes labels; keeping float32 model")
+                        return model
+        except Exception as e:
+            print(f"⚠️  int8 quantization failed ({e}); keeping float32 model")
+            return model
+        
+        return quantized
+    
+    def _trace_model(self, model):
+        """
+        TorchScript-trace and freeze the model once, so constant folding,
+        dropout removal and op fusion happen before the first filing
+        
+        The traced model is kept only if it matches eager mode on a calibration
+        batch and on a single shorter input (different batch size and length);
+        otherwise the eager model is returned.
+        """
+        batch, single = self._calibration_inputs()
+        
+        try:
+            with torch.no_grad():
+                traced = torch.jit.freeze(torch.jit.trace(model, batch, strict=False))
+            
+            # The comparison doubles as a warm-up at two input shapes
+            with torch.inference_mode():
+                for args in (batch, single):
+                    if not torch.allclose(traced(*args)[0], model(*args)[0], atol=1e-4):
+                        print("⚠️  Traced FinBERT disagrees with eager mode; using eager model")
+                        return model
+        except Exception as e:
+            print(f"⚠️  TorchScript tracing failed ({e}); using eager model")
+            return model
+        
+        return traced
+    
     def analyze(self, text, max_sentences=20):
         """
         Analyze sentiment of text
@@ -37,66 +120,86 @@ class SentimentAnalyzer:
             return self._empty_result()
         
         # Split into sentences
-        sentences = self._split_sentences(text)
-        sentences = sentences[:max_sentences]  # Take first N sentences
+        sentences = self._split_sentences(text, limit=max_sentences)  # First N sentences
         
         if not sentences:
             return self._empty_result()
         
-        # Analyze each sentence
-        results = []
-        for sentence in sentences:
-            if len(sentence) > 20:  # Skip very short sentences
-                sentiment = self._analyze_sentence(sentence)
-                results.append(sentiment)
+        # Analyze all sentences in one batched forward pass
+        # (skip very short sentences, truncate long ones)
+        kept = [s[:500] for s in sentences if len(s) > 20]
         
-        if not results:
+        if not kept:
             return self._empty_result()
         
+        label_ids = self._classify_cached(kept)
+        
         # Aggregate results
-        return self._aggregate_results(results)
+        return self._aggregate_results(label_ids)
     
-    def _analyze_sentence(self, sentence):
-        """Analyze a single sentence"""
-        # Tokenize (max 512 tokens for FinBERT)
+    def _classify_cached(self, sentences):
+        """Label ids for sentences, batching only the ones not in the LRU cache"""
+        # FinBERT is uncased and the tokenizer collapses whitespace, so
+        # normalizing the key does not change the prediction
+        keys = [self._WHITESPACE.sub(' ', s).lower().strip() for s in sentences]
+        
+        found = {}
+        for key in keys:
+            if key in self._cache:
+                found[key] = self._cache[key]
+                self._cache.move_to_end(key)
+        
+        misses = [k for k in dict.fromkeys(keys) if k not in found]
+        if misses:
+            for key, label_id in zip(misses, self._classify(misses)):
+                found[key] = self._cache[key] = int(label_id)
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        
+        return np.array([found[k] for k in keys], dtype=np.int64)
+    
+    def _classify(self, sentences):
+        """FinBERT label ids for a batch of sentences (0=positive, 1=negative, 2=neutral)"""
+        # Tokenize together (max 512 tokens for FinBERT); padding is masked out
         inputs = self.tokenizer(
-            sentence[:500],  # Truncate long sentences
+            sentences,
             return_tensors="pt",
             padding=True,
             truncation=True,
             max_length=512
         )
         
-        # Get prediction
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
-        
-        # FinBERT labels: 0=positive, 1=negative, 2=neutral
-        probs = predictions[0].numpy()
-        label_id = np.argmax(probs)
-        
-        labels = ['positive', 'negative', 'neutral']
+        # Get predictions (positional args: the traced model takes no kwargs;
+        # token_type_ids are all zero for single sentences)
+        with torch.inference_mode():
+            logits = self.model(inputs['input_ids'], inputs['attention_mask'])[0]
+            probs = torch.nn.functional.softmax(logits, dim=-1).numpy()
         
-        return {
-            'label': labels[label_id],
-            'score': float(probs[label_id])
-        }
+        return probs.argmax(axis=1)
     
-    def _split_sentences(self, text):
-        """Split text into sentences"""
-        import re
-        sentences = re.split(r'[.!?]+', text)
-        return [s.strip() for s in sentences if s.strip()]
+    def _split_sentences(self, text, limit=None):
+        """Split text into non-empty sentences, stopping after `limit`"""
+        sentences = []
+        start = 0
+        for match in self._SENTENCE_END.finditer(text):
+            sentence = text[start:match.start()].strip()
+            start = match.end()
+            if sentence:
+                sentences.append(sentence)
+                if len(sentences) == limit:
+                    return sentences
+        
+        sentence = text[start:].strip()
+        if sentence:
+            sentences.append(sentence)
+        return sentences
     
-    def _aggregate_results(self, results):
+    def _aggregate_results(self, label_ids):
         """Aggregate sentiment results"""
-        # Count each sentiment
-        positive = sum(1 for r in results if r['label'] == 'positive')
-        negative = sum(1 for r in results if r['label'] == 'negative')
-        neutral = sum(1 for r in results if r['label'] == 'neutral')
+        # Count each sentiment (FinBERT labels: 0=positive, 1=negative, 2=neutral)
+        positive, negative, neutral = (int(c) for c in np.bincount(label_ids, minlength=3))
         
-        total = len(results)
+        total = len(label_ids)
         
         # Determine dominant sentiment
         if negative > positive and negative > neutral:
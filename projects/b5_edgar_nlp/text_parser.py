@@ -4,10 +4,31 @@ import re
 from pathlib import Path
 from bs4 import BeautifulSoup
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # pragma: no cover - selectolax is optional
+    LexborHTMLParser = None
+
 
 class TextParser:
     """Reads 10-K HTML files and extracts key sections"""
     
+    # Look for "item 1a" or "risk factors"
+    _RISK_PATTERNS = [
+        re.compile(r'item\s*1a[.\s:]*risk\s*factors'),
+        re.compile(r'item\s*1a'),
+        re.compile(r'risk\s*factors')
+    ]
+    
+    # Headings are searched in lowercase 200KB windows; the overlap is longer
+    # than any heading match, so one straddling a boundary is still found
+    _SCAN_WINDOW = 200_000
+    _SCAN_OVERLAP = 1_000
+    
+    _WHITESPACE = re.compile(r'\s+')
+    _PAGE_NUMBER = re.compile(r'page\s*\d+', re.IGNORECASE)
+    _TABLE_OF_CONTENTS = re.compile(r'table\s*of\s*contents', re.IGNORECASE)
+    
     def __init__(self):
         self.stats = {
             'total_parsed': 0,
@@ -29,8 +50,7 @@ class TextParser:
             html = Path(file_path).read_text(encoding='utf-8', errors='ignore')
             
             # Parse HTML to plain text
-            soup = BeautifulSoup(html, 'lxml')
-            full_text = soup.get_text(separator='\n', strip=True)
+            full_text = self._html_to_text(html)
             
             # Extract Risk Factors section
             risk_factors = self._extract_risk_factors(full_text)
@@ -54,23 +74,36 @@ class TextParser:
                 'found': False
             }
     
+    def _html_to_text(self, html):
+        """
+        Visible text of the document body, one text node per line
+        
+        Uses selectolax's C (Lexbor) parser when installed; BeautifulSoup builds
+        a Python tree several times the size of a 5-20 MB 10-K and is only used
+        as the fallback.
+        """
+        if LexborHTMLParser is not None:
+            try:
+                tree = LexborHTMLParser(html)
+                tree.strip_tags(['script', 'style'])
+                if tree.body is not None:
+                    return tree.body.text(separator='\n', strip=True)
+            except Exception:
+                pass
+        
+        soup = BeautifulSoup(html, 'lxml')
+        return soup.get_text(separator='\n', strip=True)
+    
     def _extract_risk_factors(self, text):
         """Find the Risk Factors section in 10-K text"""
-        text_lower = text.lower()
-        
-        # Look for "item 1a" or "risk factors"
-        patterns = [
-            r'item\s*1a[.\s:]*risk\s*factors',
-            r'item\s*1a',
-            r'risk\s*factors'
-        ]
+        # Lowercase copies are made one window at a time, and only as far
+        # into the document as the search has to go (shared across patterns)
+        windows = []
         
-        for pattern in patterns:
-            match = re.search(pattern, text_lower)
+        for pattern in self._RISK_PATTERNS:
+            start = self._search_end(pattern, text, windows)
             
-            if match:
-                start = match.end()
-                
+            if start is not None:
                 # Take next 20,000 characters (typical Risk Factors length)
                 end = start + 20000
                 section = text[start:end]
@@ -84,16 +117,29 @@ class TextParser:
         
         return ""
     
+    def _search_end(self, pattern, text, windows):
+        """End offset of the first match of `pattern` in the lowercased text, or None"""
+        step = self._SCAN_WINDOW - self._SCAN_OVERLAP
+        for i, offset in enumerate(range(0, len(text), step)):
+            if i == len(windows):
+                windows.append(text[offset:offset + self._SCAN_WINDOW].lower())
+            
+            match = pattern.search(windows[i])
+            if match:
+                return offset + match.end()
+        
+        return None
+    
     def _clean_text(self, text):
         """Clean extracted text"""
         # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = self._WHITESPACE.sub(' ', text)
         
         # Remove page numbers
-        text = re.sub(r'page\s*\d+', '', text, flags=re.IGNORECASE)
+        text = self._PAGE_NUMBER.sub('', text)
         
         # Remove table of contents
-        text = re.sub(r'table\s*of\s*contents', '', text, flags=re.IGNORECASE)
+        text = self._TABLE_OF_CONTENTS.sub('', text)
         
         return text.strip()
     
@@ -31,6 +31,13 @@ class WalkForwardBacktester:
         
         risk_scores = investable.set_index('ticker')['risk_score']
         
+        # Sorted regime dates/labels, so each cycle's lookup is a binary search
+        regimes = regimes.assign(
+            date=pd.to_datetime(regimes['date']).dt.tz_localize(None)
+        ).sort_values('date', kind='stable')
+        self._regime_dates = regimes['date'].to_numpy()
+        self._regime_vals = regimes['regime'].to_numpy(np.int8)
+        
         results = []
         n_samples = len(returns_panel)
         start_idx = self.train_window
@@ -52,7 +59,7 @@ class WalkForwardBacktester:
             print(f"Test:  {test_dates[0].date()} to {test_dates[-1].date()}")
             
             train_returns = returns_panel.iloc[train_start:train_end]
-            current_regime = self._get_regime(train_dates[-1], regimes)
+            current_regime = self._get_regime(train_dates[-1])
             
             weights, opt_results = self.optimizer.optimize(
                 returns_df=train_returns.T,
@@ -87,14 +94,13 @@ class WalkForwardBacktester:
         
         return pd.DataFrame(results)
 
-    def _get_regime(self, date, regimes):
-        regimes['date'] = pd.to_datetime(regimes['date']).dt.tz_localize(None)
-        date = pd.Timestamp(date).tz_localize(None)
-        regimes = regimes.sort_values('date')
-        past_regimes = regimes[regimes['date'] <= date]
-        if len(past_regimes) == 0:
+    def _get_regime(self, date):
+        """Latest regime on or before `date` (1 if none is known yet)"""
+        date = pd.Timestamp(date).tz_localize(None).to_datetime64()
+        idx = np.searchsorted(self._regime_dates, date, side='right') - 1
+        if idx < 0:
             return 1
-        return int(past_regimes.iloc[-1]['regime'])
+        return int(self._regime_vals[idx])
 
     
     def _compute_performance(self, returns):
@@ -15,13 +15,13 @@ def load_config(config_path="config.yaml"):
 def load_data(config):
     print("\nLoading data files...")
     
-    signals = pd.read_csv(config['data']['signals_file'])
+    signals = pd.read_parquet(config['data']['signals_file'])
     print(f"✓ Signals loaded: {len(signals)} rows")
     
     features = pd.read_parquet(config['data']['features_file'])
     print(f"✓ Features loaded: {features.shape}")
     
-    regimes = pd.read_csv(config['data']['regimes_file'])
+    regimes = pd.read_parquet(config['data']['regimes_file'])
     print(f"✓ Regimes loaded: {len(regimes)} rows")
     
     return signals, features, regimes
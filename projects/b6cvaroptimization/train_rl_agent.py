@@ -24,9 +24,9 @@ def train_rl_agent():
     with open('config.yaml', 'r') as f:
         config = yaml.safe_load(f)
     
-    signals = pd.read_csv(config['data']['signals_file'])
+    signals = pd.read_parquet(config['data']['signals_file'])
     features = pd.read_parquet(config['data']['features_file'])
-    regimes = pd.read_csv(config['data']['regimes_file'])
+    regimes = pd.read_parquet(config['data']['regimes_file'])
     
     # Prepare data
     investable = signals[signals['signal'].isin(['STRONG_BUY', 'BUY'])]